@@ -107,6 +107,10 @@ class Settings(BaseSettings):
     CACHE_TTL_CONTEXT: int = Field(default=86400)
     CACHE_TTL_TOOLS: int = Field(default=3600)
     CACHE_TTL_CONVERSATION: int = Field(default=1800)
+    CACHE_TTL_EMBEDDING: int = Field(default=604800)  # 7 dana
+
+    # Embedding cache (in-process LRU + Redis) - see services/embedding_service.py
+    ENABLE_EMBEDDING_CACHE: bool = Field(default=True)
     
     # =========================================================================
     # MONITORING
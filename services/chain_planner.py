@@ -6,8 +6,11 @@ Single responsibility: Create execution plans with multiple paths
 and fallback strategies for complex queries.
 """
 
+import hashlib
 import json
 import logging
+import time
+from collections import OrderedDict
 from dataclasses import dataclass, field
 from enum import Enum
 from typing import Dict, Any, List, Optional
@@ -75,6 +78,10 @@ class ChainPlanner:
     4. LLM-based intelligent planning
     """
 
+    # LLM plans cached per (normalized query, context, tools) - bounded LRU
+    PLAN_CACHE_SIZE = 256
+    PLAN_CACHE_TTL = 600  # seconds
+
     def __init__(self):
         """Initialize with OpenAI client."""
         self.openai = AsyncAzureOpenAI(
@@ -83,6 +90,9 @@ class ChainPlanner:
             api_version=settings.AZURE_OPENAI_API_VERSION
         )
 
+        # key → (stored_at, plan JSON); JSON so every hit parses fresh objects
+        self._plan_cache: OrderedDict[str, tuple] = OrderedDict()
+
     async def create_plan(
         self,
         query: str,
@@ -113,16 +123,53 @@ class ChainPlanner:
         context_summary = self._summarize_context(user_context)
         tools_summary = self._summarize_tools(tool_scores[:10])  # More tools for chain
 
-        # Ask LLM to plan
-        plan_response = await self._get_plan_from_llm(
-            query, context_summary, tools_summary
-        )
+        # Same query with the same user context and tool candidates
+        # reuses the previous LLM plan
+        cache_key = self._plan_cache_key(query, context_summary, tools_summary)
+        plan_response = self._plan_cache_get(cache_key)
+        if plan_response is not None:
+            logger.info("ChainPlanner cache hit")
+        else:
+            # Ask LLM to plan
+            plan_response = await self._get_plan_from_llm(
+                query, context_summary, tools_summary
+            )
+
+            if not plan_response:
+                return self._create_fallback_plan(query, tool_scores)
 
-        if not plan_response:
-            return self._create_fallback_plan(query, tool_scores)
+            self._plan_cache_put(cache_key, plan_response)
 
         return self._parse_plan_response(plan_response, tool_scores)
 
+    @staticmethod
+    def _plan_cache_key(query: str, context: str, tools: str) -> str:
+        """Hash of case/whitespace-normalized query plus planner inputs."""
+        normalized = " ".join(query.lower().split())
+        raw = "\0".join((normalized, context, tools))
+        return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+    def _plan_cache_get(self, key: str) -> Optional[Dict[str, Any]]:
+        """Get cached LLM plan (fresh dict) or None if missing/expired."""
+        cached = self._plan_cache.get(key)
+        if cached is None:
+            return None
+
+        stored_at, plan_json = cached
+        if time.monotonic() - stored_at >= self.PLAN_CACHE_TTL:
+            del self._plan_cache[key]
+            return None
+
+        self._plan_cache.move_to_end(key)
+        return json.loads(plan_json)
+
+    def _plan_cache_put(self, key: str, plan_response: Dict[str, Any]) -> None:
+        """Store LLM plan, evicting the least recently used entry when full."""
+        self._plan_cache[key] = (time.monotonic(), json.dumps(plan_response))
+        self._plan_cache.move_to_end(key)
+        if len(self._plan_cache) > self.PLAN_CACHE_SIZE:
+            self._plan_cache.popitem(last=False)
+
     def _check_simple_cases(
         self,
         query: str,
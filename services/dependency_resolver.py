@@ -25,17 +25,271 @@ Primjer 3 (posvojne reference):
 NO HARDCODING - sve se temelji na DependencyGraph i output_keys.
 """
 
+import asyncio
 import logging
 import re
-from typing import Dict, Any, Optional, List, Tuple
+import sys
+import time
+from collections import OrderedDict, defaultdict
+from functools import cached_property, lru_cache
+from typing import Callable, Dict, Any, Optional, List, Pattern, Tuple, Union
 
-from services.patterns import PatternRegistry, ValuePattern
+import httpx
+
+from services.patterns import PatternRegistry, ValuePattern, compile_union
+from services.tool_contracts import ToolExecutionContext
 from dataclasses import dataclass, field
 
+from rapidfuzz import fuzz, process, utils as fuzz_utils
+
 logger = logging.getLogger(__name__)
 
+# Interned EntityReference field values - shared by every detection
+ENTITY_VEHICLE = sys.intern("vehicle")
+REF_ORDINAL = sys.intern("ordinal")
+REF_POSSESSIVE = sys.intern("possessive")
+REF_NAME = sys.intern("name")
+
+# Expected provider call failures (network, timeouts) - logged without traceback
+_REMOTE_ERRORS: Tuple[type, ...] = (httpx.HTTPError, TimeoutError, ConnectionError)
+
+# Response wrapper keys holding the payload, in priority order
+_WRAPPER_KEYS: Tuple[str, ...] = ('Data', 'data', 'Items', 'items', 'Results', 'results')
+_WRAPPER_KEY_SET = frozenset(_WRAPPER_KEYS)
+
+# List wrappers also include OData "value"
+_LIST_WRAPPER_KEYS: Tuple[str, ...] = _WRAPPER_KEYS + ('value',)
+
+
+# Vehicle name fields, most descriptive first
+_DISPLAY_KEYS: Tuple[str, ...] = ("FullVehicleName", "Name", "DisplayName")
+
+
+# Plate fields, preferred first
+_PLATE_KEYS: Tuple[str, ...] = ("LicencePlate", "Plate")
+
+
+def _first_value(vehicle: Dict[str, Any], keys: Tuple[str, ...]) -> Any:
+    """First truthy value among keys, or ""."""
+    for key in keys:
+        value = vehicle.get(key)
+        if value:
+            return value
+    return ""
+
+
+def _display_and_plate(vehicle: Dict[str, Any]) -> Tuple[Any, Any]:
+    """(display name, licence plate) of a vehicle, "" where missing."""
+    return _first_value(vehicle, _DISPLAY_KEYS), _first_value(vehicle, _PLATE_KEYS)
+
+
+@lru_cache(maxsize=8)
+def _compile_value_union(patterns: Tuple[Pattern, ...]) -> Optional[Pattern]:
+    """Case-sensitive union of value patterns, shared by all resolver instances."""
+    return compile_union(list(patterns), fold_case=False)
+
+
+@lru_cache(maxsize=256)
+def _id_key_ranks(param_name: str, id_keys: Tuple[str, ...]) -> Dict[str, int]:
+    """Lowercased ID key → priority (0 = best), built once per parameter."""
+    ranks: Dict[str, int] = {}
+    for key in (param_name, param_name.replace('Id', ''), *id_keys):
+        ranks.setdefault(key.lower(), len(ranks))
+    return ranks
+
+
+def _extract_ranked_id(
+    d: Dict[str, Any],
+    prefix: Tuple[Any, ...],
+    ranks: Dict[str, int]
+) -> Optional[Tuple[Tuple[Any, ...], str]]:
+    """
+    Find the best-ranked non-empty ID key of one dict level.
+
+    Single case-insensitive pass; the first key seen wins on ties.
+
+    Returns:
+        Tuple of (prefix + (key,), value) or None
+    """
+    best_rank, best_key = len(ranks), None
+    for k, v in d.items():
+        if v:
+            rank = ranks.get(k.lower(), best_rank)
+            if rank < best_rank:
+                best_rank, best_key = rank, k
+                if rank == 0:
+                    break
+
+    if best_key is None:
+        return None
+    return prefix + (best_key,), str(d[best_key])
+
+
+def _build_filter(parts: List[Tuple[str, str, Any]]) -> str:
+    """Build Filter expression: [("Name", "~", "Golf"), ...] → "Name(~)Golf;..."."""
+    return ";".join(f"{key}({op}){value}" for key, op, value in parts)
+
+
+def _compile_union(patterns: List[Tuple[str, str]]) -> Dict[str, Pattern]:
+    """
+    Combine (pattern, entity_type) pairs into one alternation per entity type.
+
+    Each alternative is wrapped in a named group (g0, g1, ...) so the
+    matched alternative is available as match.lastgroup. Patterns are
+    lowercase and run against lowercased text, so no IGNORECASE is needed.
+    """
+    by_type: Dict[str, List[str]] = {}
+    for i, (pattern, entity_type) in enumerate(patterns):
+        by_type.setdefault(entity_type, []).append(f'(?P<g{i}>{pattern})')
+
+    return {
+        entity_type: re.compile('|'.join(parts))
+        for entity_type, parts in by_type.items()
+    }
+
+
+_REGEX_METACHARS = frozenset('\\.^$*+?{}[]|()')
+
+
+def _literal_prefix(pattern: str) -> str:
+    """
+    Leading literal text every match of a pattern must start with.
+
+    "moje?\\s+vozilo" → "moj" (a quantified last char is optional);
+    "" when the pattern starts with regex syntax or has a top-level "|".
+    """
+    depth = 0
+    escaped = False
+    for ch in pattern:
+        if escaped:
+            escaped = False
+        elif ch == '\\':
+            escaped = True
+        elif ch in '([':
+            depth += 1
+        elif ch in ')]':
+            depth -= 1
+        elif ch == '|' and depth == 0:
+            return ''
+
+    prefix: List[str] = []
+    for ch in pattern:
+        if ch in _REGEX_METACHARS:
+            if ch in '?*{' and prefix:
+                prefix.pop()
+            break
+        prefix.append(ch)
+    return ''.join(prefix)
+
+
+def _derive_triggers(patterns: List[Tuple[str, str]]) -> Dict[str, Tuple[str, ...]]:
+    """
+    Literal trigger substrings per entity type, from the patterns' prefixes.
+
+    Types with a pattern that has no literal prefix get no entry (the
+    regex is always run); triggers covered by a shorter one are dropped.
+    """
+    prefixes: Dict[str, set] = {}
+    no_prefix = set()
+    for pattern, entity_type in patterns:
+        prefix = _literal_prefix(pattern)
+        if prefix:
+            prefixes.setdefault(entity_type, set()).add(prefix)
+        else:
+            no_prefix.add(entity_type)
+
+    triggers: Dict[str, Tuple[str, ...]] = {}
+    for entity_type, found in prefixes.items():
+        if entity_type in no_prefix:
+            continue
+        triggers[entity_type] = tuple(sorted(
+            p for p in found if not any(q != p and q in p for q in found)
+        ))
+    return triggers
+
+
+def _has_trigger(text: str, triggers: Optional[Tuple[str, ...]]) -> bool:
+    """Check for any trigger substring (no triggers configured = always True)."""
+    if triggers is None:
+        return True
+    return any(trigger in text for trigger in triggers)
 
-@dataclass
+
+# "keyword\s*(\d+)" - ordinal pattern that is a plain keyword followed by digits
+# Every ordinal pattern captures (\d+) - text without a digit cannot match
+_DIGIT_PATTERN = re.compile(r'\d')
+
+_LITERAL_ORDINAL_PATTERN = re.compile(r'([a-z]+)\\s\*\(\\d\+\)')
+
+
+def _split_ordinal_patterns(
+    patterns: List[Tuple[str, str]]
+) -> Tuple[Dict[str, Tuple[str, ...]], List[Tuple[str, str]]]:
+    """
+    Split ordinal patterns into literal keywords and regex-only patterns.
+
+    Returns:
+        ({entity_type: (keyword, ...)}, [(pattern, entity_type), ...])
+    """
+    literals: Dict[str, Tuple[str, ...]] = {}
+    residual: List[Tuple[str, str]] = []
+    for pattern, entity_type in patterns:
+        literal = _LITERAL_ORDINAL_PATTERN.fullmatch(pattern)
+        if literal:
+            literals[entity_type] = literals.get(entity_type, ()) + (literal.group(1),)
+        else:
+            residual.append((pattern, entity_type))
+    return literals, residual
+
+
+def _scan_literal_ordinal(
+    text: str,
+    keywords: Tuple[str, ...]
+) -> Optional[Tuple[int, int, int]]:
+    """
+    Find leftmost "keyword<spaces><digits>" with a positive number.
+
+    Equivalent to searching each keyword\s*(\d+) pattern, without regex.
+
+    Returns:
+        Tuple of (start, end, ordinal) or None
+    """
+    best = None
+    length = len(text)
+    for keyword in keywords:
+        idx = text.find(keyword)
+        while idx != -1 and (best is None or idx < best[0]):
+            digits_start = idx + len(keyword)
+            while digits_start < length and text[digits_start].isspace():
+                digits_start += 1
+            digits_end = digits_start
+            while digits_end < length and text[digits_end].isdecimal():
+                digits_end += 1
+
+            if digits_end > digits_start:
+                ordinal = int(text[digits_start:digits_end])
+                if ordinal >= 1:
+                    best = (idx, digits_end, ordinal)
+                    break
+
+            idx = text.find(keyword, idx + 1)
+    return best
+
+
+def _make_path_extractor(path: Tuple[Any, ...]) -> Callable[[Any], Optional[str]]:
+    """Build an extractor that follows a fixed key/index path into a response."""
+    def extractor(data: Any) -> Optional[str]:
+        try:
+            for step in path:
+                data = data[step]
+        except (KeyError, IndexError, TypeError):
+            return None
+        return str(data) if data else None
+
+    return extractor
+
+
+@dataclass(frozen=True, slots=True)
 class ResolutionResult:
     """Result of dependency resolution."""
     success: bool
@@ -48,7 +302,7 @@ class ResolutionResult:
     feedback: Optional[Dict[str, Any]] = None
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class EntityReference:
     """
     Detected entity reference from user text.
@@ -62,6 +316,18 @@ class EntityReference:
     is_possessive: bool = False  # For "moje vozilo", "moj auto"
 
 
+@dataclass(frozen=True, slots=True)
+class NormalizedQuery:
+    """Search text normalized once for vehicle matching."""
+    raw: str  # Stripped original ("VW Golf")
+    lower: str  # "vw golf"
+
+    @classmethod
+    def from_text(cls, text: str) -> "NormalizedQuery":
+        raw = text.strip()
+        return cls(raw=raw, lower=raw.lower())
+
+
 class DependencyResolver:
     """
     Resolves parameter dependencies automatically.
@@ -136,14 +402,97 @@ class DependencyResolver:
     # Ovo je ROBUSNIJI pristup jer radi s bilo kojim vozilom u bazi.
     VEHICLE_NAME_PATTERNS: List[str] = []  # Intentionally empty - use fuzzy match instead
 
+    # Pre-compiled at class load (Performance optimization) - reused on every call
+    # Literal-keyword ordinals ("vozilo\s*(\d+)") are matched with str.find;
+    # only the remaining patterns ("#(\d+)\s*vozilo") need the regex engine.
+    # One alternation per entity type, so the text is scanned once per family
+    ORDINAL_LITERALS, _ORDINAL_RESIDUAL = _split_ordinal_patterns(ORDINAL_PATTERNS)
+    ORDINAL_UNION: Dict[str, Pattern] = _compile_union(_ORDINAL_RESIDUAL)
+    POSSESSIVE_UNION: Dict[str, Pattern] = _compile_union(POSSESSIVE_PATTERNS)
+
+    # Entity types with at least one reference pattern, in declaration order
+    ENTITY_TYPES: Tuple[str, ...] = tuple(
+        dict.fromkeys(t for _, t in ORDINAL_PATTERNS + POSSESSIVE_PATTERNS)
+    )
+
+    # Literal substrings every regex alternative requires - when none is
+    # present the union cannot match and the regex search is skipped.
+    # Substrings, not tokens: patterns have no word boundaries ("#2", "mom").
+    # Derived from the patterns, so adding a pattern cannot go unmatched
+    ORDINAL_TRIGGERS: Dict[str, Tuple[str, ...]] = _derive_triggers(_ORDINAL_RESIDUAL)
+    POSSESSIVE_TRIGGERS: Dict[str, Tuple[str, ...]] = _derive_triggers(POSSESSIVE_PATTERNS)
+    VEHICLE_NAME_PATTERNS_COMPILED: List[Pattern] = [
+        re.compile(p, re.IGNORECASE) for p in VEHICLE_NAME_PATTERNS
+    ]
+
     # Patterns for recognizing human-readable values
     # REFACTORED: Now uses centralized PatternRegistry instead of hardcoded patterns
     # This ensures consistency across the entire codebase
-    @property
+    # Built once per resolver - the registry's patterns are static
+    @cached_property
     def VALUE_PATTERNS(self) -> List[ValuePattern]:
         """Get value patterns from centralized PatternRegistry."""
         return PatternRegistry.get_value_patterns()
 
+    @cached_property
+    def _value_union(self) -> Optional[Pattern]:
+        """
+        All VALUE_PATTERNS as one alternation (group pN = VALUE_PATTERNS[N]).
+
+        Values are uppercased before matching, so per-pattern IGNORECASE
+        is dropped instead of case-folding a second time in the engine.
+        Compiled once per process - instances with the same patterns
+        share one engine, like the class-level reference unions.
+        """
+        return _compile_value_union(tuple(p.pattern for p in self.VALUE_PATTERNS))
+
+    @cached_property
+    def _value_pattern_by_group(self) -> Dict[str, ValuePattern]:
+        """Union group name → ValuePattern (avoids parsing lastgroup per call)."""
+        return {f'p{i}': p for i, p in enumerate(self.VALUE_PATTERNS)}
+
+    # Generic ID key names tried after the parameter's own name
+    _ID_KEYS: Tuple[str, ...] = (
+        'Id', 'VehicleId', 'vehicle_id', 'PersonId', 'person_id',
+    )
+
+    # Tool name fragments that mark mutating tools (never used as providers)
+    _MUTATION_NAME_PARTS: Tuple[str, ...] = ('delete', 'remove', 'update', 'put', 'patch')
+    # Pre-compiled (Performance optimization) - one scan instead of any() over parts
+    _MUTATION_NAME_RE: Pattern = re.compile('|'.join(_MUTATION_NAME_PARTS))
+
+    # Max number of resolved values kept in the LRU resolution cache
+    RESOLUTION_CACHE_SIZE = 256
+
+    # Max number of distinct texts remembered by detect_* memoization
+    DETECTION_CACHE_SIZE = 1024
+
+    # Minimum RapidFuzz WRatio score (0-100) for a fuzzy vehicle match
+    FUZZY_SCORE_CUTOFF = 60
+
+    # Vehicle lists at least this long are scored with one batched cdist call
+    FUZZY_BATCH_MIN_CHOICES = 50
+
+    # Vehicle fields searched by fuzzy name matching
+    _FUZZY_FIELDS: Tuple[str, ...] = (
+        'FullVehicleName', 'Name', 'DisplayName', 'Description', 'LicencePlate', 'VIN',
+    )
+
+    # Max number of (stored vehicle list, search term) fuzzy match results kept
+    MATCH_CACHE_SIZE = 256
+
+    # Fuzzy choice strings and exact indexes kept per stored vehicle list
+    CHOICES_CACHE_SIZE = 64
+
+    # Fetched vehicle lists kept per (tenant, person, tool), and for how long
+    VEHICLE_LIST_CACHE_SIZE = 256
+    VEHICLE_LIST_TTL = 300  # seconds
+
+    # Provider failures that mean the Filter itself was rejected - only these
+    # (not transport/auth errors) justify re-fetching the list without it
+    FILTER_ERROR_STATUSES = frozenset({400, 422})
+    FILTER_ERROR_CODES = frozenset({"PARAMETER_VALIDATION_ERROR", "HTTP_400", "HTTP_422"})
+
     # Mapping: parameter name → provider tool patterns
     # These are semantic mappings, not hardcoded tool names
     PARAM_PROVIDERS: Dict[str, Dict[str, Any]] = {
@@ -169,6 +518,20 @@ class DependencyResolver:
         },
     }
 
+    # Output keys lowercased and deduplicated once ('VehicleId'/'vehicleId'
+    # are one index lookup), in priority order
+    for _config in PARAM_PROVIDERS.values():
+        _config['output_keys_lower'] = tuple(
+            dict.fromkeys(key.lower() for key in _config['output_keys'])
+        )
+    del _config
+
+    # Base name ("vehicle") → provider config, built once at class load
+    _PARAM_CONFIG_BY_BASE: Dict[str, Dict[str, Any]] = {
+        param_type.replace('id', ''): config
+        for param_type, config in PARAM_PROVIDERS.items()
+    }
+
     def __init__(self, registry: Any):
         """
         Initialize resolver with tool registry.
@@ -177,7 +540,53 @@ class DependencyResolver:
             registry: ToolRegistry instance for finding provider tools
         """
         self.registry = registry
-        self._resolution_cache: Dict[str, Any] = {}
+        # Keyed by (param, value, tenant_id, person_id) - see _cache_key()
+        # Bounded LRU (RESOLUTION_CACHE_SIZE) - see _cache_get()/_cache_put()
+        self._resolution_cache: OrderedDict[Tuple[Any, ...], Dict[str, Any]] = OrderedDict()
+
+        # In-flight resolutions by cache key - deduplicates concurrent misses
+        self._inflight: Dict[Tuple[Any, ...], asyncio.Future] = {}
+
+        # Detection is a pure function of the normalized text - memoize it
+        self._detect_value_type_cached = lru_cache(
+            maxsize=self.DETECTION_CACHE_SIZE
+        )(self._match_value_type)
+        self._detect_entity_reference_cached = lru_cache(
+            maxsize=self.DETECTION_CACHE_SIZE
+        )(self._match_entity_reference)
+
+        # Provider lookup indexes (see find_provider_tool)
+        self._output_key_index: Dict[str, List[Tuple[int, str]]] = {}
+        self._output_key_index_signature: Optional[Tuple[int, int]] = None
+        self._tool_ids_lower: List[Tuple[str, str]] = []
+        self._provider_tool_cache: Dict[str, Optional[str]] = {}
+        self._provider_definition_cache: Dict[str, Any] = {}
+        self._provider_cache_signature: Optional[Tuple[int, int]] = None
+
+        # Fuzzy match position per (stored vehicle list key, search term) - bounded LRU
+        self._match_cache: OrderedDict[Tuple[Any, ...], Optional[int]] = OrderedDict()
+
+        # Fuzzy choice strings per stored vehicle list key
+        self._choices_cache: OrderedDict[Tuple[Any, ...], List[str]] = OrderedDict()
+
+        # Exact name/plate → position per stored vehicle list key
+        self._exact_index_cache: OrderedDict[Tuple[Any, ...], Dict[str, int]] = OrderedDict()
+
+        # User's vehicle list per (tenant_id, person_id, tool): (fetched_at, vehicles)
+        self._vehicle_list_cache: OrderedDict[Tuple[Any, ...], Tuple[float, List[Dict[str, Any]]]] = OrderedDict()
+
+        # Parameter carrying person_id per provider tool (None = no such param)
+        self._person_id_param_cache: Dict[str, Optional[str]] = {}
+
+        # Specialized ID extractors learned per (provider tool, param)
+        self._extractor_cache: Dict[Tuple[str, str], Callable[[Any], Optional[str]]] = {}
+
+        # Filter templates per known filter field ("LicencePlate(=)%s"),
+        # built once so build_filter_query does a single % substitution
+        self._filter_templates: Dict[str, str] = {
+            p.filter_field: p.filter_field + '(=)%s'
+            for p in self.VALUE_PATTERNS
+        }
 
         logger.info("DependencyResolver initialized")
 
@@ -197,17 +606,36 @@ class DependencyResolver:
         if not value or not isinstance(value, str):
             return None
 
-        value_upper = value.upper().strip()
+        return self._detect_value_type_cached(value.strip().upper())
 
-        for pattern in self.VALUE_PATTERNS:
-            if pattern.pattern.match(value_upper):
-                logger.info(
-                    f"🔍 Detected {pattern.description}: '{value}' "
-                    f"→ {pattern.param_type}.{pattern.filter_field}"
-                )
-                return (pattern.param_type, pattern.filter_field)
+    def _match_value_type(self, value_upper: str) -> Optional[Tuple[str, str]]:
+        """Match normalized value against VALUE_PATTERNS (memoized per instance)."""
+        # O(1) length/character checks reject most inputs before any regex runs
+        if not any(
+            p.prefilter is None or p.prefilter(value_upper) for p in self.VALUE_PATTERNS
+        ):
+            return None
 
-        return None
+        value_union = self._value_union
+        if value_union is not None:
+            # Single regex dispatch - the winning group names the pattern
+            match = value_union.match(value_upper)
+            pattern = self._value_pattern_by_group[match.lastgroup] if match else None
+        else:
+            pattern = next(
+                (p for p in self.VALUE_PATTERNS if p.pattern.match(value_upper)), None
+            )
+
+        if pattern is None:
+            return None
+
+        if logger.isEnabledFor(logging.INFO):
+            logger.info(
+                "🔍 Detected %s: %r → %s.%s",
+                pattern.description, value_upper,
+                pattern.param_type, pattern.filter_field
+            )
+        return (pattern.param_type, pattern.filter_field)
 
     def find_provider_tool(
         self,
@@ -227,61 +655,134 @@ class DependencyResolver:
         Returns:
             Tool operation_id that can provide this parameter
         """
+        # Result depends only on registry contents - memoize until it changes
+        signature = self._registry_signature()
+        if signature != self._provider_cache_signature:
+            self._provider_tool_cache.clear()
+            self._provider_definition_cache.clear()
+            # Reloaded tools may have different parameter schemas
+            self._person_id_param_cache.clear()
+            self._provider_cache_signature = signature
+
+        if missing_param in self._provider_tool_cache:
+            return self._provider_tool_cache[missing_param]
+
+        tool_id = self._lookup_provider_tool(missing_param)
+        self._provider_tool_cache[missing_param] = tool_id
+        return tool_id
+
+    def _get_provider_tool(self, missing_param: str) -> Tuple[Optional[str], Optional[Any]]:
+        """
+        Get (provider tool_id, tool definition) for a parameter.
+
+        Both halves are memoized and invalidated together with
+        find_provider_tool's cache.
+        """
+        tool_id = self.find_provider_tool(missing_param)
+        if not tool_id:
+            return None, None
+
+        tool = self._provider_definition_cache.get(tool_id)
+        if tool is None:
+            tool = self.registry.get_tool(tool_id)
+            if tool is not None:
+                self._provider_definition_cache[tool_id] = tool
+        return tool_id, tool
+
+    def _lookup_provider_tool(self, missing_param: str) -> Optional[str]:
+        """Uncached provider search behind find_provider_tool()."""
         param_lower = missing_param.lower()
 
         # Normalize param name (remove common suffixes)
         base_param = param_lower.replace('id', '').replace('_', '')
 
         # Check if we have provider config for this param type
-        provider_config = None
-        for param_type, config in self.PARAM_PROVIDERS.items():
-            if param_type.replace('id', '') == base_param or param_lower == param_type:
-                provider_config = config
-                break
+        provider_config = (
+            self._PARAM_CONFIG_BY_BASE.get(base_param) or
+            self.PARAM_PROVIDERS.get(param_lower)
+        )
 
         if not provider_config:
-            logger.warning(f"No provider config for param: {missing_param}")
+            logger.warning("No provider config for param: %s", missing_param)
             return None
 
         # Strategy 1: Check DependencyGraph
         if hasattr(self.registry, 'dependency_graph'):
             for tool_id, dep_graph in self.registry.dependency_graph.items():
                 if missing_param in dep_graph.provider_tools:
-                    logger.info(f"📦 Found provider via DependencyGraph: {tool_id}")
+                    logger.info("📦 Found provider via DependencyGraph: %s", tool_id)
                     return tool_id
 
-        # Strategy 2: Search tools by output_keys
-        for tool_id, tool in self.registry.tools.items():
-            # Check if tool provides any of the expected output keys
-            tool_outputs_lower = [k.lower() for k in tool.output_keys]
+        # Strategy 2: Search tools by output_keys (reverse index lookup)
+        # Earliest tool in registry order wins, same as a linear scan would
+        tools = self.registry.tools
+        output_key_index = self._get_output_key_index()
+        preferred_method = provider_config.get('preferred_method', 'GET')
+        best = None
+        for expected_key in provider_config['output_keys_lower']:
+            for position, tool_id in output_key_index.get(expected_key, ()):
+                # Prefer GET methods for lookups
+                if tools[tool_id].method == preferred_method:
+                    if best is None or position < best[0]:
+                        best = (position, tool_id, expected_key)
+                    break
+
+        if best:
+            logger.info(
+                "📦 Found provider via output_keys: %s (provides %s)",
+                best[1], best[2]
+            )
+            return best[1]
 
-            for expected_key in provider_config['output_keys']:
-                if expected_key.lower() in tool_outputs_lower:
-                    # Prefer GET methods for lookups
-                    if tool.method == provider_config.get('preferred_method', 'GET'):
+        # Strategy 3: Search by name patterns
+        # Delete/update tools are already excluded from _tool_ids_lower
+        self._get_output_key_index()  # refreshes _tool_ids_lower
+        tools = self.registry.tools
+        search_terms = provider_config['search_terms']
+        for tool_id, tool_id_lower in self._tool_ids_lower:
+            for search_term in search_terms:
+                if search_term in tool_id_lower:
+                    if tools[tool_id].method == preferred_method:
                         logger.info(
-                            f"📦 Found provider via output_keys: {tool_id} "
-                            f"(provides {expected_key})"
+                            "📦 Found provider via name pattern: %s", tool_id
                         )
                         return tool_id
 
-        # Strategy 3: Search by name patterns
-        for tool_id, tool in self.registry.tools.items():
-            tool_id_lower = tool_id.lower()
-
-            for search_term in provider_config['search_terms']:
-                if search_term in tool_id_lower:
-                    if tool.method == provider_config.get('preferred_method', 'GET'):
-                        # Avoid delete/update tools
-                        if not any(x in tool_id_lower for x in ['delete', 'remove', 'update', 'put', 'patch']):
-                            logger.info(
-                                f"📦 Found provider via name pattern: {tool_id}"
-                            )
-                            return tool_id
-
-        logger.warning(f"❌ No provider found for: {missing_param}")
+        logger.warning("❌ No provider found for: %s", missing_param)
         return None
 
+    def _registry_signature(self) -> Tuple[int, int]:
+        """Cheap fingerprint of registry tools, changes when tools are loaded."""
+        tools = self.registry.tools
+        return (id(tools), len(tools))
+
+    def _get_output_key_index(self) -> Dict[str, List[Tuple[int, str]]]:
+        """
+        Get reverse index: lowercased output key → [(registry position, tool_id)].
+
+        Built lazily and rebuilt when the registry's tools dict changes
+        (tools are loaded after the resolver is created). Lowercased tool
+        IDs for name matching (mutating tools excluded) are refreshed
+        together with the index.
+        """
+        tools = self.registry.tools
+        signature = self._registry_signature()
+        if signature != self._output_key_index_signature:
+            index: Dict[str, List[Tuple[int, str]]] = defaultdict(list)
+            for position, (tool_id, tool) in enumerate(tools.items()):
+                for key in tool.output_keys:
+                    index[key.lower()].append((position, tool_id))
+
+            self._output_key_index = dict(index)
+            ids_lower = ((tool_id, tool_id.lower()) for tool_id in tools)
+            self._tool_ids_lower = [
+                (tool_id, tool_id_lower) for tool_id, tool_id_lower in ids_lower
+                if self._MUTATION_NAME_RE.search(tool_id_lower) is None
+            ]
+            self._output_key_index_signature = signature
+
+        return self._output_key_index
+
     def build_filter_query(
         self,
         filter_field: str,
@@ -305,11 +806,12 @@ class DependencyResolver:
 
         # Build filter string
         # Most APIs use: Filter=Field(=)Value or Filter=Field eq 'Value'
+        template = self._filter_templates.get(filter_field) or filter_field + '(=)%s'
         filter_params = {
-            'Filter': f"{filter_field}(=){clean_value}"
+            'Filter': template % clean_value
         }
 
-        logger.debug(f"Built filter query: {filter_params}")
+        logger.debug("Built filter query: %s", filter_params)
 
         return filter_params
 
@@ -334,21 +836,60 @@ class DependencyResolver:
         Returns:
             ResolutionResult with resolved value or error
         """
-        logger.info(f"🔗 Resolving dependency: {missing_param}")
+        logger.info("🔗 Resolving dependency: %s", missing_param)
 
         # Check cache first
-        cache_key = f"{missing_param}:{user_value}"
-        if cache_key in self._resolution_cache:
-            cached = self._resolution_cache[cache_key]
-            logger.info(f"✅ Cache hit for {cache_key}")
-            return ResolutionResult(
-                success=True,
-                resolved_value=cached['value'],
-                provider_tool=cached['tool']
-            )
+        cached = self.try_cached_resolution(missing_param, user_value, user_context)
+        if cached is not None:
+            return cached
+        cache_key = self._cache_key(missing_param, user_value, user_context)
+
+        # Concurrent callers asking for the same resolution share one
+        # provider call (shielded so one caller's cancellation doesn't
+        # cancel it for the others)
+        task = self._inflight.get(cache_key)
+        if task is None:
+            task = asyncio.ensure_future(self._resolve_uncached(
+                missing_param, user_value, user_context, executor, cache_key
+            ))
+            self._inflight[cache_key] = task
+            task.add_done_callback(lambda _: self._inflight.pop(cache_key, None))
+        return await asyncio.shield(task)
+
+    async def resolve_many(
+        self,
+        missing: List[Tuple[str, Optional[str]]],
+        user_context: Dict[str, Any],
+        executor: Any
+    ) -> List[ResolutionResult]:
+        """
+        Resolve several independent parameters concurrently.
+
+        Primjer: VehicleId i PersonId u istom potezu - latency is the
+        slowest provider call instead of the sum of all of them.
+
+        Args:
+            missing: [(missing_param, user_value), ...]
 
+        Returns:
+            ResolutionResult per entry, in input order
+        """
+        return list(await asyncio.gather(*(
+            self.resolve_dependency(param, value, user_context, executor)
+            for param, value in missing
+        )))
+
+    async def _resolve_uncached(
+        self,
+        missing_param: str,
+        user_value: Optional[str],
+        user_context: Dict[str, Any],
+        executor: Any,
+        cache_key: Tuple[Any, ...]
+    ) -> ResolutionResult:
+        """Provider call behind resolve_dependency() for a cache miss."""
         # Find provider tool
-        provider_tool_id = self.find_provider_tool(missing_param)
+        provider_tool_id, provider_tool = self._get_provider_tool(missing_param)
 
         if not provider_tool_id:
             return ResolutionResult(
@@ -356,7 +897,6 @@ class DependencyResolver:
                 error_message=f"Ne mogu pronaći način za dohvatiti {missing_param}"
             )
 
-        provider_tool = self.registry.get_tool(provider_tool_id)
         if not provider_tool:
             return ResolutionResult(
                 success=False,
@@ -368,43 +908,25 @@ class DependencyResolver:
 
         # If user provided a value, try to use it as filter
         if user_value:
-            value_type = self.detect_value_type(user_value)
+            # Normalize once - detection and filter share the stripped value
+            user_value_clean = user_value.strip()
+            value_type = (
+                self._detect_value_type_cached(user_value_clean.upper())
+                if user_value_clean else None
+            )
 
             if value_type:
                 param_type, filter_field = value_type
-                provider_params = self.build_filter_query(filter_field, user_value)
+                provider_params = self.build_filter_query(filter_field, user_value_clean)
             else:
                 # Try as generic search/name filter
-                provider_params = {'Filter': f"Name(~){user_value}"}
+                provider_params = {'Filter': "Name(~)" + user_value}
 
         # CRITICAL FIX v12.2: ALWAYS inject PersonId for user-specific data
-        person_id = user_context.get('person_id')
-        if person_id:
-            person_param_injected = False
-            # Try to inject PersonId as direct parameter using schema-based classification
-            for param_name, param_def in provider_tool.parameters.items():
-                if param_def.context_key == "person_id":
-                    provider_params[param_name] = person_id
-                    person_param_injected = True
-                    logger.info(f"🎯 Dependency resolution: filtering by {param_name}={person_id}")
-                    break
-
-            # If no direct param match but Filter exists, add to Filter
-            if not person_param_injected and 'Filter' in provider_tool.parameters:
-                existing_filter = provider_params.get('Filter', '')
-                if existing_filter:
-                    # Combine with existing filter using semicolon
-                    provider_params['Filter'] = f"{existing_filter};PersonId(=){person_id}"
-                else:
-                    provider_params['Filter'] = f"PersonId(=){person_id}"
-                logger.info(f"🎯 Added PersonId filter to dependency resolution")
-        else:
-            logger.warning("⚠️ No person_id in user_context for dependency resolution")
+        self._inject_person_filter(provider_tool, provider_params, user_context)
 
         # Execute provider tool
         try:
-            from services.tool_contracts import ToolExecutionContext
-
             exec_context = ToolExecutionContext(
                 user_context=user_context,
                 tool_outputs={},
@@ -426,21 +948,22 @@ class DependencyResolver:
                 )
 
             # Extract the ID we need from result
-            resolved_value = self._extract_id_from_result(
+            resolved_value = self._extract_id_for_tool(
                 result.data,
-                missing_param
+                missing_param,
+                provider_tool_id
             )
 
             if resolved_value:
                 # Cache the resolution
-                self._resolution_cache[cache_key] = {
+                self._cache_put(cache_key, {
                     'value': resolved_value,
                     'tool': provider_tool_id
-                }
+                })
 
                 logger.info(
-                    f"✅ Resolved {missing_param} = {resolved_value} "
-                    f"via {provider_tool_id}"
+                    "✅ Resolved %s = %s via %s",
+                    missing_param, resolved_value, provider_tool_id
                 )
 
                 return ResolutionResult(
@@ -456,13 +979,134 @@ class DependencyResolver:
                     error_message=f"Provider {provider_tool_id} nije vratio {missing_param}"
                 )
 
+        except _REMOTE_ERRORS as e:
+            # Expected provider failure - no traceback needed
+            logger.warning("Resolution provider error: %s", e)
+            return ResolutionResult(
+                success=False,
+                error_message=f"Greška pri resolvanju: {str(e)}"
+            )
         except Exception as e:
-            logger.error(f"Resolution error: {e}", exc_info=True)
+            logger.error("Resolution error: %s", e, exc_info=True)
             return ResolutionResult(
                 success=False,
                 error_message=f"Greška pri resolvanju: {str(e)}"
             )
 
+    @staticmethod
+    def _cache_key(
+        missing_param: str,
+        user_value: Optional[str],
+        user_context: Dict[str, Any]
+    ) -> Tuple[Any, ...]:
+        """
+        Build resolution cache key scoped to tenant and person.
+
+        Resolved IDs depend on whose data the provider returned, so the same
+        value must not be shared between tenants or users.
+        """
+        return (
+            sys.intern(missing_param),
+            user_value,
+            user_context.get('tenant_id'),
+            user_context.get('person_id'),
+        )
+
+    def try_cached_resolution(
+        self,
+        missing_param: str,
+        user_value: Optional[str],
+        user_context: Dict[str, Any]
+    ) -> Optional[ResolutionResult]:
+        """
+        Synchronous cache probe for resolve_dependency().
+
+        Callers can check this before awaiting, so cache hits skip the
+        coroutine entirely.
+
+        Returns:
+            Cached ResolutionResult or None on miss
+        """
+        cache_key = self._cache_key(missing_param, user_value, user_context)
+        cached = self._cache_get(cache_key)
+        if not cached:
+            return None
+
+        logger.info("✅ Cache hit for %s", cache_key)
+        return ResolutionResult(
+            success=True,
+            resolved_value=cached['value'],
+            provider_tool=cached['tool']
+        )
+
+    def _cache_get(self, cache_key: Tuple[Any, ...]) -> Optional[Dict[str, Any]]:
+        """Get cached resolution and mark it as recently used."""
+        cached = self._resolution_cache.get(cache_key)
+        if cached is not None:
+            self._resolution_cache.move_to_end(cache_key)
+        return cached
+
+    def _cache_put(self, cache_key: Tuple[Any, ...], entry: Dict[str, Any]) -> None:
+        """Store resolution, evicting the least recently used entry when full."""
+        self._resolution_cache[cache_key] = entry
+        self._resolution_cache.move_to_end(cache_key)
+        if len(self._resolution_cache) > self.RESOLUTION_CACHE_SIZE:
+            self._resolution_cache.popitem(last=False)
+
+    def _inject_person_filter(
+        self,
+        provider_tool: Any,
+        provider_params: Dict[str, Any],
+        user_context: Dict[str, Any]
+    ) -> None:
+        """
+        Add PersonId to provider params (in place) for user-specific data.
+
+        Prefers a direct parameter classified as person_id; otherwise
+        appends PersonId to the Filter parameter.
+        """
+        person_id = user_context.get('person_id')
+        if not person_id:
+            logger.warning("⚠️ No person_id in user_context for dependency resolution")
+            return
+
+        # Try to inject PersonId as direct parameter using schema-based classification
+        param_name = self._person_id_param_for(provider_tool)
+        if param_name:
+            provider_params[param_name] = person_id
+            logger.info("🎯 Dependency resolution: filtering by %s=%s", param_name, person_id)
+            return
+
+        # If no direct param match but Filter exists, add to Filter
+        if 'Filter' in provider_tool.parameters:
+            existing_filter = provider_params.get('Filter', '')
+            if existing_filter:
+                # Combine with existing filter using semicolon
+                provider_params['Filter'] = existing_filter + ";PersonId(=)" + str(person_id)
+            else:
+                provider_params['Filter'] = "PersonId(=)" + str(person_id)
+            logger.info("🎯 Added PersonId filter to dependency resolution")
+
+    def _person_id_param_for(self, provider_tool: Any) -> Optional[str]:
+        """
+        Get the parameter classified as person_id for a tool (cached).
+
+        Tool schemas are static, so the parameter scan runs once per tool.
+        """
+        tool_id = provider_tool.operation_id
+        if tool_id in self._person_id_param_cache:
+            return self._person_id_param_cache[tool_id]
+
+        param_name = next(
+            (
+                name for name, param_def in provider_tool.parameters.items()
+                if param_def.context_key == "person_id"
+            ),
+            None
+        )
+        self._person_id_param_cache[tool_id] = param_name
+        return param_name
+
     def _extract_id_from_result(
         self,
         data: Any,
@@ -477,54 +1121,88 @@ class DependencyResolver:
         - Wrapped: {"Data": [{"Id": "123"}]}
         - Items: {"Items": [{"Id": "123"}]}
         """
-        if not data:
+        located = self._locate_id(data, param_name)
+        return located[1] if located else None
+
+    def _extract_id_for_tool(
+        self,
+        data: Any,
+        param_name: str,
+        tool_id: str
+    ) -> Optional[str]:
+        """
+        Extract ID from a provider tool response using its learned path.
+
+        A provider tool always returns the same response shape, so after the
+        first generic extraction the path (e.g. Items[0].VehicleId) is turned
+        into a specialized extractor. If the specialized extractor misses,
+        it is dropped and the generic search runs again.
+        """
+        cache_key = (tool_id, param_name)
+        extractor = self._extractor_cache.get(cache_key)
+        if extractor is not None:
+            value = extractor(data)
+            if value:
+                return value
+            del self._extractor_cache[cache_key]
+
+        located = self._locate_id(data, param_name)
+        if not located:
             return None
 
-        # Possible key names for the ID
-        param_lower = param_name.lower()
-        possible_keys = [
-            param_name,
-            param_name.replace('Id', ''),
-            'Id', 'id', 'ID',
-            'VehicleId', 'vehicleId', 'vehicle_id',
-            'PersonId', 'personId', 'person_id',
-        ]
-
-        def extract_from_dict(d: dict) -> Optional[str]:
-            for key in possible_keys:
-                if key in d and d[key]:
-                    return str(d[key])
-            # Case insensitive search
-            for k, v in d.items():
-                if k.lower() == param_lower or k.lower() == 'id':
-                    if v:
-                        return str(v)
+        path, value = located
+        self._extractor_cache[cache_key] = _make_path_extractor(path)
+        return value
+
+    def _locate_id(
+        self,
+        data: Any,
+        param_name: str
+    ) -> Optional[Tuple[Tuple[Any, ...], str]]:
+        """
+        Find ID value in API response together with the path to it.
+
+        Returns:
+            Tuple of (path, value), e.g. (("Items", 0, "VehicleId"), "123")
+        """
+        if not data:
             return None
 
+        # Possible key names for the ID with their priority (memoized per param)
+        ranks = _id_key_ranks(param_name, self._ID_KEYS)
+
         # Handle different response structures
         if isinstance(data, dict):
             # Try direct extraction
-            result = extract_from_dict(data)
+            result = _extract_ranked_id(data, (), ranks)
             if result:
                 return result
 
-            # Try nested structures
-            for wrapper_key in ['Data', 'data', 'Items', 'items', 'Results', 'results']:
-                if wrapper_key in data:
+            # Try nested structures (one C-level intersection finds all wrappers)
+            present = data.keys() & _WRAPPER_KEY_SET
+            for wrapper_key in (_WRAPPER_KEYS if present else ()):
+                if wrapper_key in present:
                     nested = data[wrapper_key]
                     if isinstance(nested, list) and nested:
-                        return extract_from_dict(nested[0])
+                        return _extract_ranked_id(nested[0], (wrapper_key, 0), ranks)
                     elif isinstance(nested, dict):
-                        return extract_from_dict(nested)
+                        return _extract_ranked_id(nested, (wrapper_key,), ranks)
 
         elif isinstance(data, list) and data:
-            return extract_from_dict(data[0])
+            return _extract_ranked_id(data[0], (0,), ranks)
 
         return None
 
     def clear_cache(self) -> None:
-        """Clear resolution cache."""
+        """Clear resolution and provider lookup caches."""
         self._resolution_cache.clear()
+        self._provider_tool_cache.clear()
+        self._provider_definition_cache.clear()
+        self._person_id_param_cache.clear()
+        self._match_cache.clear()
+        self._choices_cache.clear()
+        self._exact_index_cache.clear()
+        self._vehicle_list_cache.clear()
         logger.info("Resolution cache cleared")
 
     # ═══════════════════════════════════════════════════════════════
@@ -558,70 +1236,88 @@ class DependencyResolver:
         if not text:
             return None
 
-        text_lower = text.lower().strip()
+        # Strip first so lower() only copies the meaningful part
+        return self._detect_entity_reference_cached(text.strip().lower(), entity_type)
 
-        # 1. Check ordinal patterns ("Vozilo 1", "Auto 2")
-        for pattern, p_type in self.ORDINAL_PATTERNS:
-            if p_type != entity_type:
-                continue
+    def detect_all_entity_references(self, text: str) -> Dict[str, EntityReference]:
+        """
+        Detect references for every known entity type in one call.
 
-            match = re.search(pattern, text_lower, re.IGNORECASE)
-            if match:
-                ordinal = int(match.group(1))
+        Text is normalized once and each type goes through the memoized
+        detection, so callers needing several types don't re-normalize.
 
-                # Validate ordinal is positive (1-indexed user input)
-                if ordinal < 1:
-                    logger.debug(f"Invalid ordinal {ordinal} - skipping")
-                    continue
+        Returns:
+            Dict of entity_type → EntityReference (types without a match omitted)
+        """
+        if not text:
+            return {}
 
-                # Convert 1-indexed to 0-indexed
-                ordinal_index = ordinal - 1
+        text_lower = text.strip().lower()
+        references = {}
+        for entity_type in self.ENTITY_TYPES:
+            reference = self._detect_entity_reference_cached(text_lower, entity_type)
+            if reference:
+                references[entity_type] = reference
+        return references
 
-                logger.info(
-                    f"🔢 Detected ordinal reference: '{text}' → "
-                    f"{entity_type}[{ordinal_index}]"
-                )
+    def _match_entity_reference(
+        self,
+        text_lower: str,
+        entity_type: str
+    ) -> Optional[EntityReference]:
+        """Match normalized text against reference patterns (memoized per instance)."""
+        # 1. Check ordinal patterns ("Vozilo 1", "Auto 2")
+        ordinal_hit = self._find_ordinal(text_lower, entity_type)
+        if ordinal_hit:
+            start, end, ordinal = ordinal_hit
 
-                return EntityReference(
-                    entity_type=entity_type,
-                    reference_type="ordinal",
-                    value=match.group(0),
-                    ordinal_index=ordinal_index,
-                    is_possessive=False
-                )
+            # Convert 1-indexed to 0-indexed
+            ordinal_index = ordinal - 1
 
-        # 2. Check possessive patterns ("moje vozilo", "moj auto")
-        for pattern, p_type in self.POSSESSIVE_PATTERNS:
-            if p_type != entity_type:
-                continue
+            logger.info(
+                "🔢 Detected ordinal reference: '%s' → %s[%s]",
+                text_lower, entity_type, ordinal_index
+            )
 
-            match = re.search(pattern, text_lower, re.IGNORECASE)
-            if match:
-                logger.info(
-                    f"👤 Detected possessive reference: '{text}' → "
-                    f"user's {entity_type}"
-                )
+            return EntityReference(
+                entity_type=entity_type,
+                reference_type=REF_ORDINAL,
+                value=text_lower[start:end],
+                ordinal_index=ordinal_index,
+                is_possessive=False
+            )
 
-                return EntityReference(
-                    entity_type=entity_type,
-                    reference_type="possessive",
-                    value=match.group(0),
-                    ordinal_index=0,  # Default to first/primary
-                    is_possessive=True
-                )
+        # 2. Check possessive patterns ("moje vozilo", "moj auto")
+        possessive_union = self.POSSESSIVE_UNION.get(entity_type)
+        match = None
+        if possessive_union is not None and _has_trigger(
+            text_lower, self.POSSESSIVE_TRIGGERS.get(entity_type)
+        ):
+            match = possessive_union.search(text_lower)
+        if match:
+            logger.info(
+                "👤 Detected possessive reference: '%s' → user's %s",
+                text_lower, entity_type
+            )
+
+            return EntityReference(
+                entity_type=entity_type,
+                reference_type=REF_POSSESSIVE,
+                value=match.group(0),
+                ordinal_index=0,  # Default to first/primary
+                is_possessive=True
+            )
 
         # 3. Check vehicle name patterns (Golf, Passat, etc.)
-        if entity_type == "vehicle":
-            for name_pattern in self.VEHICLE_NAME_PATTERNS:
-                match = re.search(name_pattern, text_lower, re.IGNORECASE)
+        if entity_type == ENTITY_VEHICLE:
+            for name_pattern in self.VEHICLE_NAME_PATTERNS_COMPILED:
+                match = name_pattern.search(text_lower)
                 if match:
-                    logger.info(
-                        f"🚗 Detected vehicle name: '{match.group(0)}'"
-                    )
+                    logger.info("🚗 Detected vehicle name: '%s'", match.group(0))
 
                     return EntityReference(
-                        entity_type="vehicle",
-                        reference_type="name",
+                        entity_type=ENTITY_VEHICLE,
+                        reference_type=REF_NAME,
                         value=match.group(0),
                         ordinal_index=None,
                         is_possessive=False
@@ -629,6 +1325,47 @@ class DependencyResolver:
 
         return None
 
+    def _find_ordinal(
+        self,
+        text_lower: str,
+        entity_type: str
+    ) -> Optional[Tuple[int, int, int]]:
+        """
+        Find the leftmost valid ordinal reference in text.
+
+        Returns:
+            Tuple of (start, end, ordinal) with ordinal >= 1, or None
+        """
+        # One C-level scan rejects digit-free text (the common case)
+        if _DIGIT_PATTERN.search(text_lower) is None:
+            return None
+
+        best = _scan_literal_ordinal(
+            text_lower, self.ORDINAL_LITERALS.get(entity_type, ())
+        )
+
+        ordinal_union = self.ORDINAL_UNION.get(entity_type)
+        if ordinal_union is None or not _has_trigger(
+            text_lower, self.ORDINAL_TRIGGERS.get(entity_type)
+        ):
+            return best
+
+        for match in ordinal_union.finditer(text_lower):
+            if best and match.start() >= best[0]:
+                break
+
+            # Digits are the capture group right after the matched alternative
+            ordinal = int(match.group(match.re.groupindex[match.lastgroup] + 1))
+
+            # Validate ordinal is positive (1-indexed user input)
+            if ordinal < 1:
+                logger.debug("Invalid ordinal %s - skipping", ordinal)
+                continue
+
+            return match.start(), match.end(), ordinal
+
+        return best
+
     async def resolve_entity_reference(
         self,
         reference: EntityReference,
@@ -657,10 +1394,10 @@ class DependencyResolver:
         Returns:
             ResolutionResult with UUID or error
         """
-        logger.info(f"🔍 Resolving entity: {reference}")
+        logger.info("🔍 Resolving entity: %s", reference)
 
         # STRATEGY 1: Possessive - use user's default vehicle
-        if reference.is_possessive or reference.reference_type == "possessive":
+        if reference.is_possessive or reference.reference_type == REF_POSSESSIVE:
             vehicle = user_context.get("vehicle", {})
             vehicle_id = vehicle.get("id") or vehicle.get("vehicle_id")
 
@@ -669,7 +1406,7 @@ class DependencyResolver:
                 plate = vehicle.get("licence_plate") or vehicle.get("plate", "")
 
                 logger.info(
-                    f"✅ Resolved possessive to user's vehicle: {vehicle_id}"
+                    "✅ Resolved possessive to user's vehicle: %s", vehicle_id
                 )
                 return ResolutionResult(
                     success=True,
@@ -684,25 +1421,20 @@ class DependencyResolver:
                     }
                 )
             else:
-                # No default vehicle - try to fetch user's vehicles
+                # No default vehicle - fetch user's vehicles, take the first
                 logger.info("User has no default vehicle, fetching list...")
-                reference = EntityReference(
-                    entity_type="vehicle",
-                    reference_type="ordinal",
-                    value=reference.value,
-                    ordinal_index=0,  # First vehicle
-                    is_possessive=False
+                return await self._resolve_by_ordinal_index(
+                    user_context, executor, index=0, original_ref=reference
                 )
-                # Fall through to ordinal resolution
 
         # STRATEGY 2: Ordinal - fetch list and pick by index
-        if reference.reference_type == "ordinal":
+        if reference.reference_type == REF_ORDINAL:
             return await self._resolve_by_ordinal(
                 reference, user_context, executor
             )
 
         # STRATEGY 3: Name - search by vehicle name/description
-        if reference.reference_type == "name":
+        if reference.reference_type == REF_NAME:
             return await self._resolve_by_name(
                 reference, user_context, executor
             )
@@ -726,11 +1458,30 @@ class DependencyResolver:
         CRITICAL FIX v12.2: ALWAYS filter by PersonId to get user-specific data,
         not first result from tenant!
         """
+        return await self._resolve_by_ordinal_index(
+            user_context, executor,
+            index=reference.ordinal_index or 0,
+            original_ref=reference
+        )
+
+    async def _resolve_by_ordinal_index(
+        self,
+        user_context: Dict[str, Any],
+        executor: Any,
+        index: int,
+        original_ref: EntityReference
+    ) -> ResolutionResult:
+        """
+        Resolve vehicle at 0-based index in the user's vehicle list.
+
+        original_ref is the detected reference (ordinal, or possessive
+        falling back to the first vehicle); only its value is used.
+        """
         # Find provider tool for listing vehicles
         # NOTE: We use ONLY semantic search via find_provider_tool()
         # No hardcoded tool names like "masterdata" - the system should
         # find the right tool based on output_keys and search_terms
-        provider_tool_id = self.find_provider_tool("VehicleId")
+        provider_tool_id, provider_tool = self._get_provider_tool("VehicleId")
 
         if not provider_tool_id:
             return ResolutionResult(
@@ -738,7 +1489,6 @@ class DependencyResolver:
                 error_message="Ne mogu pronaći alat za dohvat vozila"
             )
 
-        provider_tool = self.registry.get_tool(provider_tool_id)
         if not provider_tool:
             return ResolutionResult(
                 success=False,
@@ -746,50 +1496,39 @@ class DependencyResolver:
             )
 
         # CRITICAL FIX v12.2: ALWAYS filter by PersonId for user-specific data
+        # (person_id parameter resolved once per tool - see _person_id_param_for)
         provider_params = {}
-        person_id = user_context.get("person_id")
-
-        if person_id:
-            # Try to inject PersonId using schema-based classification
-            person_param_injected = False
-            for param_name, param_def in provider_tool.parameters.items():
-                if param_def.context_key == "person_id":
-                    provider_params[param_name] = person_id
-                    person_param_injected = True
-                    logger.info(f"🎯 Filtering by {param_name}={person_id} for user-specific data")
-                    break
-
-            # If no direct param match, try using Filter parameter
-            if not person_param_injected and "Filter" in provider_tool.parameters:
-                provider_params["Filter"] = f"PersonId(=){person_id}"
-                logger.info(f"🎯 Using Filter=PersonId(=){person_id} for user-specific data")
-        else:
-            logger.warning("⚠️ No person_id in user_context - may return tenant-wide data!")
+        self._inject_person_filter(provider_tool, provider_params, user_context)
 
         try:
-            from services.tool_contracts import ToolExecutionContext
-
-            exec_context = ToolExecutionContext(
-                user_context=user_context,
-                tool_outputs={},
-                conversation_state={}
-            )
-
-            result = await executor.execute(
-                tool=provider_tool,
-                llm_params=provider_params,
-                execution_context=exec_context
-            )
+            # Recently fetched list for this user skips the provider call
+            # (ordinals are always indexed into the live list cache - no
+            # separate per-ordinal cache that could outlive the list)
+            vehicles = self._get_cached_vehicle_list(user_context, provider_tool_id)
+            if vehicles is None:
+                exec_context = ToolExecutionContext(
+                    user_context=user_context,
+                    tool_outputs={},
+                    conversation_state={}
+                )
 
-            if not result.success:
-                return ResolutionResult(
-                    success=False,
-                    provider_tool=provider_tool_id,
-                    error_message=result.error_message
+                result = await executor.execute(
+                    tool=provider_tool,
+                    llm_params=provider_params,
+                    execution_context=exec_context
                 )
 
-            # Extract vehicle list
-            vehicles = self._extract_vehicle_list(result.data)
+                if not result.success:
+                    return ResolutionResult(
+                        success=False,
+                        provider_tool=provider_tool_id,
+                        error_message=result.error_message
+                    )
+
+                # Extract vehicle list
+                vehicles = self._extract_vehicle_list(result.data)
+                if vehicles:
+                    self._store_vehicle_list(user_context, provider_tool_id, vehicles)
 
             if not vehicles:
                 return ResolutionResult(
@@ -799,7 +1538,6 @@ class DependencyResolver:
                 )
 
             # Get vehicle by ordinal index
-            index = reference.ordinal_index or 0
             if index < 0:
                 index = 0
             if index >= len(vehicles):
@@ -816,25 +1554,19 @@ class DependencyResolver:
             vehicle_id = self._extract_id_from_result(vehicle, "VehicleId")
 
             if vehicle_id:
-                # Cache for future use
-                cache_key = f"ordinal:{reference.value}"
-                self._resolution_cache[cache_key] = {
-                    "value": vehicle_id,
-                    "tool": provider_tool_id
-                }
-
                 # Log which vehicle was selected
-                vehicle_name = (
-                    vehicle.get("FullVehicleName") or
-                    vehicle.get("Name") or
-                    vehicle.get("DisplayName") or
-                    f"Vozilo {index + 1}"
-                )
-                plate = vehicle.get("LicencePlate") or vehicle.get("Plate", "")
+                vehicle_name, plate = _display_and_plate(vehicle)
+                vehicle_name = vehicle_name or f"Vozilo {index + 1}"
+                feedback = {
+                    "entity_type": "vehicle",
+                    "resolved_to": vehicle_name,
+                    "plate": plate,
+                    "reference": f"Vozilo {index + 1}"
+                }
 
                 logger.info(
-                    f"✅ Resolved ordinal {index + 1} → "
-                    f"{vehicle_name} ({plate}) = {vehicle_id}"
+                    "✅ Resolved ordinal %d → %s (%s) = %s",
+                    index + 1, vehicle_name, plate, vehicle_id
                 )
 
                 return ResolutionResult(
@@ -842,12 +1574,7 @@ class DependencyResolver:
                     resolved_value=vehicle_id,
                     provider_tool=provider_tool_id,
                     provider_params={"ordinal": index + 1},
-                    feedback={
-                        "entity_type": "vehicle",
-                        "resolved_to": vehicle_name,
-                        "plate": plate,
-                        "reference": f"Vozilo {index + 1}"
-                    }
+                    feedback=feedback
                 )
 
             return ResolutionResult(
@@ -856,13 +1583,79 @@ class DependencyResolver:
                 error_message="Nije moguće izvući ID vozila"
             )
 
+        except _REMOTE_ERRORS as e:
+            logger.warning("Ordinal resolution provider error: %s", e)
+            return ResolutionResult(
+                success=False,
+                error_message=f"Greška: {str(e)}"
+            )
         except Exception as e:
-            logger.error(f"Ordinal resolution error: {e}", exc_info=True)
+            logger.error("Ordinal resolution error: %s", e, exc_info=True)
             return ResolutionResult(
                 success=False,
                 error_message=f"Greška: {str(e)}"
             )
 
+    @staticmethod
+    def _vehicle_list_key(
+        user_context: Dict[str, Any],
+        provider_tool_id: str
+    ) -> Tuple[Any, ...]:
+        """Vehicle list cache key, scoped to tenant and person like _cache_key()."""
+        return (
+            user_context.get('tenant_id'),
+            user_context.get('person_id'),
+            provider_tool_id,
+        )
+
+    def _get_cached_vehicle_list(
+        self,
+        user_context: Dict[str, Any],
+        provider_tool_id: str
+    ) -> Optional[List[Dict[str, Any]]]:
+        """
+        Get the user's vehicle list from an earlier fetch by the same tool.
+
+        Returns None when missing or older than VEHICLE_LIST_TTL.
+        """
+        entry = self._get_cached_vehicle_entry(user_context, provider_tool_id)
+        return entry[1] if entry is not None else None
+
+    def _get_cached_vehicle_entry(
+        self,
+        user_context: Dict[str, Any],
+        provider_tool_id: str
+    ) -> Optional[Tuple[Tuple[Any, ...], List[Dict[str, Any]]]]:
+        """
+        Like _get_cached_vehicle_list, but also return the list's key.
+
+        The key is (tenant_id, person_id, tool, stored_at), so it changes
+        whenever the list is re-fetched - data derived from the list can
+        be cached under it without going stale.
+        """
+        key = self._vehicle_list_key(user_context, provider_tool_id)
+        cached = self._vehicle_list_cache.get(key)
+        if cached is None:
+            return None
+        if time.monotonic() - cached[0] >= self.VEHICLE_LIST_TTL:
+            del self._vehicle_list_cache[key]
+            return None
+        self._vehicle_list_cache.move_to_end(key)
+        return key + (cached[0],), cached[1]
+
+    def _store_vehicle_list(
+        self,
+        user_context: Dict[str, Any],
+        provider_tool_id: str,
+        vehicles: List[Dict[str, Any]]
+    ) -> None:
+        """Remember a fetched vehicle list for later name and ordinal references."""
+        key = self._vehicle_list_key(user_context, provider_tool_id)
+        self._vehicle_list_cache[key] = (time.monotonic(), vehicles)
+        self._vehicle_list_cache.move_to_end(key)
+        if len(self._vehicle_list_cache) > self.VEHICLE_LIST_CACHE_SIZE:
+            self._vehicle_list_cache.popitem(last=False)
+
     async def _resolve_by_name(
         self,
         reference: EntityReference,
@@ -876,7 +1669,7 @@ class DependencyResolver:
         """
         # Find provider tool
         # NOTE: No hardcoded fallbacks - use only semantic search
-        provider_tool_id = self.find_provider_tool("VehicleId")
+        provider_tool_id, provider_tool = self._get_provider_tool("VehicleId")
 
         if not provider_tool_id:
             return ResolutionResult(
@@ -884,7 +1677,6 @@ class DependencyResolver:
                 error_message="Ne mogu pronaći alat za pretragu vozila"
             )
 
-        provider_tool = self.registry.get_tool(provider_tool_id)
         if not provider_tool:
             return ResolutionResult(
                 success=False,
@@ -892,7 +1684,8 @@ class DependencyResolver:
             )
 
         # Build filter for name search
-        search_value = reference.value.strip()
+        query = NormalizedQuery.from_text(reference.value)
+        search_value = query.raw
 
         # CRITICAL FIX v12.2: Combine name search with PersonId filter
         person_id = user_context.get("person_id")
@@ -903,29 +1696,30 @@ class DependencyResolver:
         # Add PersonId filter FIRST (most important for user-specific data)
         if person_id:
             person_param_injected = False
-            for param_name, param_def in provider_tool.parameters.items():
-                if param_def.context_key == "person_id":
-                    provider_params[param_name] = person_id
-                    person_param_injected = True
-                    logger.info(f"🎯 Name search: filtering by {param_name}={person_id}")
-                    break
+            param_name = self._person_id_param_for(provider_tool)
+            if param_name:
+                provider_params[param_name] = person_id
+                person_param_injected = True
+                logger.info("🎯 Name search: filtering by %s=%s", param_name, person_id)
 
             # If no direct param, combine with Filter
             if not person_param_injected and "Filter" in provider_tool.parameters:
                 # Combine PersonId and Name filter
-                provider_params["Filter"] = f"PersonId(=){person_id};Name(~){search_value}"
-                logger.info(f"🎯 Combined filter: PersonId + Name search")
+                provider_params["Filter"] = _build_filter([
+                    ("PersonId", "=", person_id), ("Name", "~", search_value)
+                ])
+                logger.info("🎯 Combined filter: PersonId + Name search")
             else:
                 # Add name filter separately
-                provider_params["Filter"] = f"Name(~){search_value}"
+                provider_params["Filter"] = _build_filter([("Name", "~", search_value)])
         else:
             # No person_id - just search by name (may return tenant-wide results)
-            provider_params["Filter"] = f"Name(~){search_value}"
+            provider_params["Filter"] = _build_filter([("Name", "~", search_value)])
             logger.warning("⚠️ No person_id - name search may return other users' data")
 
+        vehicles = None
+        list_key = None
         try:
-            from services.tool_contracts import ToolExecutionContext
-
             exec_context = ToolExecutionContext(
                 user_context=user_context,
                 tool_outputs={},
@@ -938,40 +1732,45 @@ class DependencyResolver:
                 execution_context=exec_context
             )
 
-            if not result.success:
-                # Try without filter (just get all and search locally)
-                result = await executor.execute(
-                    tool=provider_tool,
-                    llm_params={},
-                    execution_context=exec_context
-                )
+            # Filter matched nothing (e.g. name not in the Name field) or
+            # was rejected - search the user's full list locally instead.
+            # Transport/auth failures are returned as-is (no second fetch).
+            if not self._has_vehicles(result) and (
+                result.success or self._is_filter_error(result)
+            ):
+                entry = self._get_cached_vehicle_entry(user_context, provider_tool_id)
+                if entry is None:
+                    result = await self._fetch_all_vehicles(
+                        executor, provider_tool_id, provider_tool,
+                        exec_context, user_context, result
+                    )
+                    # A successful full fetch was just stored
+                    entry = self._get_cached_vehicle_entry(user_context, provider_tool_id)
+                if entry is not None:
+                    list_key, vehicles = entry
 
-            if not result.success:
-                return ResolutionResult(
-                    success=False,
-                    provider_tool=provider_tool_id,
-                    error_message=result.error_message
-                )
+            if vehicles is None:
+                if not result.success:
+                    return ResolutionResult(
+                        success=False,
+                        provider_tool=provider_tool_id,
+                        error_message=result.error_message
+                    )
+                vehicles = self._extract_vehicle_list(result.data)
 
             # Search in results
-            vehicles = self._extract_vehicle_list(result.data)
-            matched_vehicle = self._fuzzy_match_vehicle(vehicles, search_value)
+            matched_vehicle = self._fuzzy_match_vehicle(vehicles, query, list_key)
 
             if matched_vehicle:
                 vehicle_id = self._extract_id_from_result(matched_vehicle, "VehicleId")
 
                 if vehicle_id:
-                    vehicle_name = (
-                        matched_vehicle.get("FullVehicleName") or
-                        matched_vehicle.get("Name") or
-                        search_value
-                    )
-
-                    plate = matched_vehicle.get("LicencePlate") or matched_vehicle.get("Plate", "")
+                    vehicle_name, plate = _display_and_plate(matched_vehicle)
+                    vehicle_name = vehicle_name or search_value
 
                     logger.info(
-                        f"✅ Resolved name '{search_value}' → "
-                        f"{vehicle_name} = {vehicle_id}"
+                        "✅ Resolved name '%s' → %s = %s",
+                        search_value, vehicle_name, vehicle_id
                     )
 
                     return ResolutionResult(
@@ -993,13 +1792,72 @@ class DependencyResolver:
                 error_message=f"Vozilo '{search_value}' nije pronađeno"
             )
 
+        except _REMOTE_ERRORS as e:
+            logger.warning("Name resolution provider error: %s", e)
+            return ResolutionResult(
+                success=False,
+                error_message=f"Greška: {str(e)}"
+            )
         except Exception as e:
-            logger.error(f"Name resolution error: {e}", exc_info=True)
+            logger.error("Name resolution error: %s", e, exc_info=True)
             return ResolutionResult(
                 success=False,
                 error_message=f"Greška: {str(e)}"
             )
 
+    def _is_filter_error(self, result: Any) -> bool:
+        """Check whether a failed provider call was a rejected Filter."""
+        return (
+            result.http_status in self.FILTER_ERROR_STATUSES
+            or result.error_code in self.FILTER_ERROR_CODES
+        )
+
+    async def _fetch_all_vehicles(
+        self,
+        executor: Any,
+        provider_tool_id: str,
+        provider_tool: Any,
+        exec_context: ToolExecutionContext,
+        user_context: Dict[str, Any],
+        filtered_result: Any
+    ) -> Any:
+        """
+        Fetch the user's vehicle list without the name Filter for local search.
+
+        Keeps the PersonId scoping (direct parameter or Filter clause). When
+        the tool cannot scope by person, no fetch is made - a tenant-wide list
+        would match the name against other users' vehicles. The list is
+        stored for later name and ordinal references. Returns filtered_result
+        when there is no fetch, or the fetch fails after a successful
+        filtered call.
+        """
+        params: Dict[str, Any] = {}
+        if user_context.get("person_id"):
+            self._inject_person_filter(provider_tool, params, user_context)
+            if not params:
+                logger.warning(
+                    "⚠️ %s cannot filter by person - skipping full-list name search",
+                    provider_tool_id
+                )
+                return filtered_result
+
+        fallback = await executor.execute(
+            tool=provider_tool,
+            llm_params=params,
+            execution_context=exec_context
+        )
+        if not fallback.success:
+            return filtered_result if filtered_result.success else fallback
+
+        vehicles = self._extract_vehicle_list(fallback.data)
+        if vehicles:
+            self._store_vehicle_list(user_context, provider_tool_id, vehicles)
+        return fallback
+
+    def _has_vehicles(self, result: Any) -> bool:
+        """Check that a provider result succeeded and returned vehicles."""
+        return result.success and bool(self._extract_vehicle_list(result.data))
+
     def _extract_vehicle_list(self, data: Any) -> List[Dict[str, Any]]:
         """
         Extract list of vehicles from API response.
@@ -1013,13 +1871,13 @@ class DependencyResolver:
         if isinstance(data, list):
             return data
 
-        # Wrapped response
+        # Wrapped response - keys in priority order, the common "Data"
+        # wrapper returns after a single lookup
         if isinstance(data, dict):
-            for key in ["Data", "data", "Items", "items", "Results", "results", "value"]:
-                if key in data:
-                    items = data[key]
-                    if isinstance(items, list):
-                        return items
+            for key in _LIST_WRAPPER_KEYS:
+                items = data.get(key)
+                if isinstance(items, list):
+                    return items
 
             # Single vehicle wrapped
             if "Id" in data or "VehicleId" in data:
@@ -1030,60 +1888,154 @@ class DependencyResolver:
     def _fuzzy_match_vehicle(
         self,
         vehicles: List[Dict[str, Any]],
-        search_term: str
+        search_term: Union[str, NormalizedQuery],
+        list_key: Optional[Tuple[Any, ...]] = None
     ) -> Optional[Dict[str, Any]]:
         """
         Fuzzy match vehicle by name/description.
 
         Searches in: Name, FullVehicleName, DisplayName, Description, LicencePlate
+
+        Exact name/plate hits win; otherwise RapidFuzz (C++ scorers) picks the
+        best WRatio match. Results are cached per (list_key, search term) when
+        the vehicles are a stored list (see _get_cached_vehicle_entry).
+        """
+        query = (
+            search_term if isinstance(search_term, NormalizedQuery)
+            else NormalizedQuery.from_text(search_term or "")
+        )
+        if not vehicles or not query.raw:
+            return None
+
+        if list_key is None:
+            return self._match_vehicle(vehicles, query)
+
+        # Cache stores the position, so the caller gets the fresh vehicle dict
+        cache_key = (list_key, query.raw)
+        if cache_key in self._match_cache:
+            self._match_cache.move_to_end(cache_key)
+            position = self._match_cache[cache_key]
+            return vehicles[position] if position is not None else None
+
+        matched = self._match_vehicle(vehicles, query, list_key)
+        position = next(
+            (i for i, vehicle in enumerate(vehicles) if vehicle is matched), None
+        )
+        self._match_cache[cache_key] = position
+        if len(self._match_cache) > self.MATCH_CACHE_SIZE:
+            self._match_cache.popitem(last=False)
+        return matched
+
+    def _match_vehicle(
+        self,
+        vehicles: List[Dict[str, Any]],
+        query: NormalizedQuery,
+        list_key: Optional[Tuple[Any, ...]] = None
+    ) -> Optional[Dict[str, Any]]:
+        """Uncached vehicle match (see _fuzzy_match_vehicle)."""
+        # Exact name/plate hit needs no scoring
+        exact = self._get_exact_index(vehicles, list_key).get(query.lower)
+        if exact is not None:
+            return vehicles[exact]
+
+        return self._fuzzy_match_rapidfuzz(vehicles, query.raw, list_key)
+
+    @staticmethod
+    def _exact_vehicle_index(vehicles: List[Dict[str, Any]]) -> Dict[str, int]:
+        """Map lowercased Name/FullVehicleName/LicencePlate → first position with it."""
+        index: Dict[str, int] = {}
+        for position, vehicle in enumerate(vehicles):
+            for key in ("Name", "FullVehicleName", "LicencePlate"):
+                value = vehicle.get(key)
+                if value:
+                    index.setdefault(str(value).lower(), position)
+        return index
+
+    def _per_list_cached(
+        self,
+        cache: OrderedDict,
+        list_key: Optional[Tuple[Any, ...]],
+        build: Callable[[], Any]
+    ) -> Any:
         """
-        if not vehicles or not search_term:
+        Get data derived from a vehicle list, reused for the same stored list.
+
+        Lists without a list_key are always rebuilt. Cached data must refer
+        to vehicles by position, not by object.
+        """
+        if list_key is not None:
+            cached = cache.get(list_key)
+            if cached is not None:
+                cache.move_to_end(list_key)
+                return cached
+
+        value = build()
+
+        if list_key is not None:
+            cache[list_key] = value
+            if len(cache) > self.CHOICES_CACHE_SIZE:
+                cache.popitem(last=False)
+        return value
+
+    def _get_exact_index(
+        self,
+        vehicles: List[Dict[str, Any]],
+        list_key: Optional[Tuple[Any, ...]]
+    ) -> Dict[str, int]:
+        """Exact name/plate index (see _exact_vehicle_index), reused per stored vehicle list."""
+        return self._per_list_cached(
+            self._exact_index_cache, list_key,
+            lambda: self._exact_vehicle_index(vehicles)
+        )
+
+    def _get_fuzzy_choices(
+        self,
+        vehicles: List[Dict[str, Any]],
+        list_key: Optional[Tuple[Any, ...]]
+    ) -> List[str]:
+        """Searchable text per vehicle, reused for the same stored vehicle list."""
+        # map(vehicle.get, ...) probes each field once, in C
+        fields = self._FUZZY_FIELDS
+        return self._per_list_cached(
+            self._choices_cache, list_key,
+            lambda: [
+                " ".join(str(value) for value in map(vehicle.get, fields) if value)
+                for vehicle in vehicles
+            ]
+        )
+
+    def _fuzzy_match_rapidfuzz(
+        self,
+        vehicles: List[Dict[str, Any]],
+        search_term: str,
+        list_key: Optional[Tuple[Any, ...]] = None
+    ) -> Optional[Dict[str, Any]]:
+        """Best WRatio match over the searchable vehicle fields, or None."""
+        choices = self._get_fuzzy_choices(vehicles, list_key)
+
+        if len(choices) >= self.FUZZY_BATCH_MIN_CHOICES:
+            # One multi-threaded C++ call scores the whole list
+            scores = process.cdist(
+                [search_term],
+                choices,
+                scorer=fuzz.WRatio,
+                processor=fuzz_utils.default_process,
+                score_cutoff=self.FUZZY_SCORE_CUTOFF,
+                workers=-1
+            )[0]
+            position = int(scores.argmax())
+            score = float(scores[position])
+            hit = (choices[position], score, position) if score > 0 else None
+        else:
+            hit = process.extractOne(
+                search_term,
+                choices,
+                scorer=fuzz.WRatio,
+                processor=fuzz_utils.default_process,
+                score_cutoff=self.FUZZY_SCORE_CUTOFF
+            )
+        if not hit:
             return None
 
-        search_lower = search_term.lower()
-
-        # First pass: exact match in name
-        for vehicle in vehicles:
-            name = (
-                vehicle.get("FullVehicleName") or
-                vehicle.get("Name") or
-                vehicle.get("DisplayName") or
-                ""
-            ).lower()
-
-            if search_lower in name:
-                return vehicle
-
-        # Second pass: partial match in any field
-        for vehicle in vehicles:
-            searchable = " ".join([
-                str(vehicle.get("FullVehicleName", "")),
-                str(vehicle.get("Name", "")),
-                str(vehicle.get("DisplayName", "")),
-                str(vehicle.get("Description", "")),
-                str(vehicle.get("LicencePlate", "")),
-                str(vehicle.get("VIN", "")),
-            ]).lower()
-
-            if search_lower in searchable:
-                return vehicle
-
-        # Third pass: word-level matching
-        search_words = set(search_lower.split())
-        best_match = None
-        best_score = 0
-
-        for vehicle in vehicles:
-            searchable = " ".join([
-                str(vehicle.get("FullVehicleName", "")),
-                str(vehicle.get("Name", "")),
-            ]).lower()
-
-            vehicle_words = set(searchable.split())
-            overlap = len(search_words & vehicle_words)
-
-            if overlap > best_score:
-                best_score = overlap
-                best_match = vehicle
-
-        return best_match if best_score > 0 else None
+        logger.debug("Fuzzy match '%s' → %r (score %.1f)", search_term, hit[0], hit[1])
+        return vehicles[hit[2]]
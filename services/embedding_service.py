@@ -1,16 +1,25 @@
 """
 Embedding Service - Shared embedding generation.
-Version: 1.0
+Version: 1.1
 
 Provides a simple interface for getting embeddings for any text.
 Used by:
 - SearchEngine for query embeddings
 - IntelligentRouter for category embeddings
+
+Embeddings are cached in two levels (ENABLE_EMBEDDING_CACHE):
+- L1: in-process LRU (EMBEDDING_L1_SIZE entries)
+- L2: Redis, shared between workers (see configure_cache())
 """
 
+import asyncio
+import hashlib
+import json
 import logging
-from typing import List, Optional
+from collections import OrderedDict
+from typing import Any, List, Optional, Tuple
 
+import httpx
 from openai import AsyncAzureOpenAI
 
 from config import get_settings
@@ -18,22 +27,128 @@ from config import get_settings
 logger = logging.getLogger(__name__)
 settings = get_settings()
 
+# Max characters sent to the embedding model
+MAX_EMBEDDING_CHARS = 8000
+
+# Max inputs per embeddings request (Azure OpenAI limit)
+MAX_BATCH_INPUTS = 2048
+
+# Max embedding requests in flight from one batch call
+MAX_CONCURRENT_REQUESTS = 8
+
+# Connection pool for the embeddings client (batch calls run concurrently)
+HTTP_MAX_CONNECTIONS = 100
+HTTP_MAX_KEEPALIVE = 50
+
+# HTTP/2 multiplexing needs the optional h2 package (httpx[http2])
+try:
+    import h2  # noqa: F401
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
+# In-process LRU size and Redis key prefix
+EMBEDDING_L1_SIZE = 500
+EMBEDDING_KEY_PREFIX = "emb:"
+
 # Singleton OpenAI client
 _client: Optional[AsyncAzureOpenAI] = None
 
+# L1 cache: key → embedding, least recently used first. Stored as
+# tuples so no caller can mutate a cached vector; hits return a new list
+_L1: "OrderedDict[str, Tuple[float, ...]]" = OrderedDict()
+
+# L2 cache: Redis async client, set by configure_cache()
+_redis: Optional[Any] = None
+
 
 def _get_client() -> AsyncAzureOpenAI:
     """Get or create OpenAI client."""
     global _client
     if _client is None:
+        http_client = httpx.AsyncClient(
+            http2=HTTP2_AVAILABLE,
+            timeout=httpx.Timeout(60.0, connect=5.0),
+            limits=httpx.Limits(
+                max_connections=HTTP_MAX_CONNECTIONS,
+                max_keepalive_connections=HTTP_MAX_KEEPALIVE
+            )
+        )
         _client = AsyncAzureOpenAI(
             azure_endpoint=settings.AZURE_OPENAI_ENDPOINT,
             api_key=settings.AZURE_OPENAI_API_KEY,
-            api_version=settings.AZURE_OPENAI_API_VERSION
+            api_version=settings.AZURE_OPENAI_API_VERSION,
+            http_client=http_client
         )
     return _client
 
 
+def configure_cache(redis_client: Optional[Any]) -> None:
+    """
+    Enable the shared Redis (L2) embedding cache.
+
+    Args:
+        redis_client: Redis async client (None disables L2)
+    """
+    global _redis
+    _redis = redis_client
+
+
+def _cache_key(text: str) -> str:
+    """Cache key for text under the configured embedding model."""
+    raw = f"{settings.AZURE_OPENAI_EMBEDDING_DEPLOYMENT}\0{text}"
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+def _l1_put(key: str, embedding: List[float]) -> None:
+    """Store a copy in L1, evicting the least recently used entry when full."""
+    _L1[key] = tuple(embedding)
+    _L1.move_to_end(key)
+    if len(_L1) > EMBEDDING_L1_SIZE:
+        _L1.popitem(last=False)
+
+
+async def _cache_get(key: str) -> Optional[List[float]]:
+    """Look up an embedding in L1, then L2 (promoting L2 hits to L1)."""
+    cached = _L1.get(key)
+    if cached is not None:
+        _L1.move_to_end(key)
+        return list(cached)
+
+    if _redis is None:
+        return None
+
+    try:
+        data = await _redis.get(EMBEDDING_KEY_PREFIX + key)
+    except Exception as e:
+        logger.warning(f"Embedding cache get failed: {e}")
+        return None
+
+    if not data:
+        return None
+
+    embedding = json.loads(data)
+    _l1_put(key, embedding)
+    return embedding
+
+
+async def _cache_put(key: str, embedding: List[float]) -> None:
+    """Store an embedding in both cache levels."""
+    _l1_put(key, embedding)
+
+    if _redis is None:
+        return
+
+    try:
+        await _redis.setex(
+            EMBEDDING_KEY_PREFIX + key,
+            settings.CACHE_TTL_EMBEDDING,
+            json.dumps(embedding)
+        )
+    except Exception as e:
+        logger.warning(f"Embedding cache set failed: {e}")
+
+
 async def get_embedding(text: str) -> Optional[List[float]]:
     """
     Get embedding vector for text.
@@ -47,34 +162,112 @@ async def get_embedding(text: str) -> Optional[List[float]]:
     if not text or not text.strip():
         return None
 
+    text = text[:MAX_EMBEDDING_CHARS]
+    use_cache = settings.ENABLE_EMBEDDING_CACHE
+
+    if use_cache:
+        key = _cache_key(text)
+        cached = await _cache_get(key)
+        if cached is not None:
+            return cached
+
     try:
         client = _get_client()
         response = await client.embeddings.create(
-            input=[text[:8000]],
+            input=[text],
             model=settings.AZURE_OPENAI_EMBEDDING_DEPLOYMENT
         )
-        return response.data[0].embedding
+        embedding = response.data[0].embedding
     except Exception as e:
         logger.warning(f"Embedding error for '{text[:50]}...': {e}")
         return None
 
+    if use_cache:
+        await _cache_put(key, embedding)
+    return embedding
+
 
 async def get_embeddings_batch(texts: List[str]) -> List[Optional[List[float]]]:
     """
     Get embeddings for multiple texts.
 
+    Duplicates and cached texts are skipped; the remaining texts are
+    sent in as few requests as possible (MAX_BATCH_INPUTS per request),
+    concurrently. A failed request is retried text by text.
+
     Args:
         texts: List of texts to embed
 
     Returns:
-        List of embedding vectors (None for failed ones)
+        List of embedding vectors aligned with texts (None for failed ones)
     """
     if not texts:
         return []
 
-    results = []
+    use_cache = settings.ENABLE_EMBEDDING_CACHE
+
+    # Unique non-empty texts (truncated like get_embedding)
+    unique: "OrderedDict[str, Optional[List[float]]]" = OrderedDict()
     for text in texts:
-        embedding = await get_embedding(text)
-        results.append(embedding)
+        if text and text.strip():
+            unique.setdefault(text[:MAX_EMBEDDING_CHARS], None)
+
+    texts_unique = list(unique)
+    keys = {text: _cache_key(text) for text in texts_unique} if use_cache else {}
+
+    # Cache lookups (Redis round trips) run concurrently
+    misses = texts_unique
+    if use_cache:
+        cached = await asyncio.gather(*(_cache_get(keys[t]) for t in texts_unique))
+        misses = []
+        for text, embedding in zip(texts_unique, cached):
+            if embedding is None:
+                misses.append(text)
+            else:
+                unique[text] = embedding
+
+    # Requests run concurrently, at most MAX_CONCURRENT_REQUESTS at a time
+    semaphore = asyncio.Semaphore(MAX_CONCURRENT_REQUESTS)
+
+    async def embed_one(text: str) -> None:
+        async with semaphore:
+            unique[text] = await get_embedding(text)
+
+    async def embed_chunk(chunk: List[str]) -> None:
+        async with semaphore:
+            try:
+                response = await _get_client().embeddings.create(
+                    input=chunk,
+                    model=settings.AZURE_OPENAI_EMBEDDING_DEPLOYMENT
+                )
+            except Exception as e:
+                response = None
+                logger.warning(
+                    f"Batch embedding error for {len(chunk)} texts, "
+                    f"retrying one by one: {e}"
+                )
+
+        if response is None:
+            # e.g. chunk over the request token budget
+            await asyncio.gather(*(embed_one(text) for text in chunk))
+            return
+
+        for item in response.data:
+            unique[chunk[item.index]] = item.embedding
+
+        # Cache writes (Redis round trips) run concurrently
+        if use_cache:
+            await asyncio.gather(*(
+                _cache_put(keys[chunk[item.index]], item.embedding)
+                for item in response.data
+            ))
+
+    await asyncio.gather(*(
+        embed_chunk(misses[start:start + MAX_BATCH_INPUTS])
+        for start in range(0, len(misses), MAX_BATCH_INPUTS)
+    ))
 
-    return results
+    return [
+        unique.get(text[:MAX_EMBEDDING_CHARS]) if text and text.strip() else None
+        for text in texts
+    ]
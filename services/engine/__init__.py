@@ -31,10 +31,17 @@ New in v16.0:
 - LLMResponseExtractor for intelligent data extraction
 """
 
+import asyncio
 import json
 import logging
+from types import MappingProxyType
 from typing import Dict, Any, Optional, List
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 from config import get_settings
 from services.conversation_manager import ConversationManager, ConversationState
 from services.tool_executor import ToolExecutor
@@ -48,7 +55,9 @@ from services.reasoning import Planner, ExecutionPlan, PlanStep
 # NEW v16.0: Advanced components for 100% reliability
 from services.chain_planner import ChainPlanner, get_chain_planner
 from services.executor_fallback import ExecutorWithFallback, get_executor_with_fallback
-from services.response_extractor import LLMResponseExtractor, get_response_extractor
+from services.response_extractor import (
+    LLMResponseExtractor, get_response_extractor, slim_for_llm
+)
 
 # NEW v16.1: Deterministic query routing - NO LLM guessing for known patterns
 from services.query_router import QueryRouter, get_query_router, RouteResult
@@ -68,6 +77,16 @@ settings = get_settings()
 __all__ = ['MessageEngine']
 
 
+def _dumps(obj: Any) -> str:
+    """Serialize tool arguments/results for the AI messages (orjson if installed)."""
+    if orjson is not None:
+        try:
+            return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS).decode()
+        except TypeError:
+            pass  # e.g. ints over 64 bits - stdlib handles them
+    return json.dumps(obj)
+
+
 class MessageEngine:
     """
     Main message processing engine.
@@ -83,6 +102,19 @@ class MessageEngine:
 
     MAX_ITERATIONS = 6
 
+    # Prompts for missing plan parameters, keyed by lowercased param name
+    MISSING_PARAM_PROMPTS = MappingProxyType({
+        "from": "Od kada vam treba? (npr. 'sutra u 9:00')",
+        "to": "Do kada?",
+        "fromtime": "Od kada vam treba?",
+        "totime": "Do kada?",
+        "description": "Mozete li opisati situaciju?",
+        "vehicleid": "Koje vozilo zelite?",
+        "value": "Koja je vrijednost? (npr. kilometraza)",
+        "subject": "Koji je naslov/tema?",
+        "message": "Koja je poruka?"
+    })
+
     def __init__(
         self,
         gateway,
@@ -552,25 +584,38 @@ class MessageEngine:
 
         # === END DETERMINISTIC AND INTELLIGENT ROUTING ===
 
-        # Pre-resolve entity references
-        pre_resolved = await self._pre_resolve_entity_references(
-            text, user_context, conv_manager
+        # Pre-resolve entity references, load history and score tools
+        # concurrently - independent I/O (provider call, Redis, embeddings).
+        # All three finish before any failure is handled, so no task is
+        # left running in the background.
+        pre_resolved, history, tools_with_scores = await asyncio.gather(
+            self._pre_resolve_entity_references(text, user_context, conv_manager),
+            self.context.get_recent_messages(sender),
+            self.registry.find_relevant_tools_with_scores(
+                text, top_k=10  # v16.0: More tools for better fallback options
+            ),
+            return_exceptions=True
         )
 
+        # Cancellation is never degraded - propagate it before anything else
+        for outcome in (pre_resolved, history, tools_with_scores):
+            if isinstance(outcome, asyncio.CancelledError):
+                raise outcome
+
+        # Tool scoring is required; history degrades. Pre-resolution
+        # catches its own errors, so only cancellation can surface there
+        if isinstance(tools_with_scores, BaseException):
+            raise tools_with_scores
+        if isinstance(history, BaseException):
+            logger.warning("History load failed: %s", history)
+            history = []
+
         if pre_resolved:
             logger.info(f"Pre-resolved entities: {list(pre_resolved.keys())}")
 
-        # Get history
-        history = await self.context.get_recent_messages(sender)
-
         messages = history.copy()
         messages.append({"role": "user", "content": text})
 
-        # Get relevant tools with scores
-        tools_with_scores = await self.registry.find_relevant_tools_with_scores(
-            text, top_k=10  # v16.0: More tools for better fallback options
-        )
-
         tools_with_scores = sorted(
             tools_with_scores,
             key=lambda t: t["score"],
@@ -735,6 +780,15 @@ class MessageEngine:
                     result, user_context, conv_manager, sender, user_query=text
                 )
 
+                # Early exit: mutation results already have a deterministic
+                # confirmation from the formatter - no second LLM round trip
+                if (
+                    method != "GET"
+                    and tool_response.get("success")
+                    and tool_response.get("final_response")
+                ):
+                    return tool_response["final_response"]
+
                 # v16.0: Use LLM Response Extractor for successful responses
                 if tool_response.get("success") and tool_response.get("data"):
                     try:
@@ -808,8 +862,6 @@ class MessageEngine:
                         logger.info(f"Fallback {fb_tool_name} also failed")
 
                 # Add to conversation for next iteration
-                tool_result_content = tool_response.get("data", {})
-
                 if not tool_response.get("success", True):
                     ai_feedback = tool_response.get("ai_feedback", "")
                     tool_result_content = {
@@ -817,6 +869,9 @@ class MessageEngine:
                         "message": tool_response.get("error", "Unknown error"),
                         "ai_feedback": ai_feedback
                     }
+                else:
+                    # Slimmed - the full data was already used for formatting
+                    tool_result_content = slim_for_llm(tool_response.get("data", {}))
 
                 current_messages.append({
                     "role": "assistant",
@@ -826,7 +881,7 @@ class MessageEngine:
                         "type": "function",
                         "function": {
                             "name": result["tool"],
-                            "arguments": json.dumps(result["parameters"])
+                            "arguments": _dumps(result["parameters"])
                         }
                     }]
                 })
@@ -834,7 +889,7 @@ class MessageEngine:
                 current_messages.append({
                     "role": "tool",
                     "tool_call_id": result["tool_call_id"],
-                    "content": json.dumps(tool_result_content)
+                    "content": _dumps(tool_result_content)
                 })
 
         return "Nisam uspio obraditi zahtjev. Pokusajte drugacije formulirati."
@@ -875,7 +930,7 @@ class MessageEngine:
             )
 
             if entity_ref:
-                logger.info(f"Pre-resolving entity: {entity_ref}")
+                logger.info("Pre-resolving entity: %s", entity_ref)
 
                 resolution = await self.dependency_resolver.resolve_entity_reference(
                     reference=entity_ref,
@@ -884,50 +939,44 @@ class MessageEngine:
                 )
 
                 if resolution.success:
-                    logger.info(f"Pre-resolved VehicleId: {resolution.resolved_value}")
+                    logger.info("Pre-resolved VehicleId: %s", resolution.resolved_value)
 
                     resolved["VehicleId"] = resolution.resolved_value
                     resolved["vehicleId"] = resolution.resolved_value
 
-                    if hasattr(conv_manager.context, 'tool_outputs'):
-                        conv_manager.context.tool_outputs["VehicleId"] = (
-                            resolution.resolved_value
-                        )
-                        conv_manager.context.tool_outputs["vehicleId"] = (
-                            resolution.resolved_value
-                        )
+                    # Save only when the vehicle changed - skips a Redis
+                    # round trip when the same vehicle is referenced again
+                    tool_outputs = getattr(conv_manager.context, 'tool_outputs', None)
+                    if tool_outputs is not None and (
+                        tool_outputs.get("VehicleId") != resolution.resolved_value or
+                        tool_outputs.get("vehicleId") != resolution.resolved_value
+                    ):
+                        tool_outputs["VehicleId"] = resolution.resolved_value
+                        tool_outputs["vehicleId"] = resolution.resolved_value
                         await conv_manager.save()
                 else:
-                    logger.warning(
-                        f"Failed to pre-resolve: {resolution.error_message}"
-                    )
+                    logger.warning("Failed to pre-resolve: %s", resolution.error_message)
 
+        except (TimeoutError, ConnectionError) as e:
+            # Expected transient failure (provider errors are handled by
+            # the resolver) - no stack capture
+            logger.warning("Entity pre-resolution failed: %s", e)
         except Exception as e:
-            logger.error(f"Entity pre-resolution error: {e}", exc_info=True)
+            logger.error("Entity pre-resolution error: %s", e, exc_info=True)
 
         return resolved
 
     def _build_missing_data_prompt(self, missing_params: List[str]) -> str:
         """Build user-friendly prompt for missing parameters."""
-        param_prompts = {
-            "from": "Od kada vam treba? (npr. 'sutra u 9:00')",
-            "to": "Do kada?",
-            "FromTime": "Od kada vam treba?",
-            "ToTime": "Do kada?",
-            "Description": "Mozete li opisati situaciju?",
-            "VehicleId": "Koje vozilo zelite?",
-            "Value": "Koja je vrijednost? (npr. kilometraza)",
-            "Subject": "Koji je naslov/tema?",
-            "Message": "Koja je poruka?"
-        }
+        param_prompts = self.MISSING_PARAM_PROMPTS
 
         if len(missing_params) == 1:
             param = missing_params[0]
-            return param_prompts.get(param, f"Trebam jos: {param}")
+            return param_prompts.get(param.lower(), f"Trebam jos: {param}")
 
         lines = ["Za nastavak trebam jos informacije:"]
         for param in missing_params[:3]:
-            prompt = param_prompts.get(param, param)
+            prompt = param_prompts.get(param.lower(), param)
             lines.append(f"* {prompt}")
 
         return "\n".join(lines)
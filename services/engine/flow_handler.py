@@ -6,10 +6,12 @@ Single responsibility: Handle selection, confirmation, gathering, and availabili
 """
 
 import logging
+import re
 from typing import Dict, Any, List, Optional
 
 from services.booking_contracts import AssigneeType, EntryType
 from services.error_translator import get_error_translator
+from services.tool_contracts import ToolExecutionContext
 
 logger = logging.getLogger(__name__)
 
@@ -25,6 +27,9 @@ class FlowHandler:
     - Handle availability checks
     """
 
+    # Pre-compiled at class load (Performance optimization) - numbers in replies
+    NUMBER_PATTERN = re.compile(r'\d+')
+
     def __init__(self, registry, executor, ai, formatter):
         """Initialize flow handler."""
         self.registry = registry
@@ -79,7 +84,6 @@ class FlowHandler:
                 "final_response": f"Tehnicki problem - alat '{tool_name}' nije pronaden."
             }
 
-        from services.tool_contracts import ToolExecutionContext
         execution_context = ToolExecutionContext(
             user_context=user_context,
             tool_outputs={},
@@ -360,7 +364,6 @@ class FlowHandler:
             booking_context["entrytype"] = int(EntryType.BOOKING)  # 0
             booking_context["assigneetype"] = int(AssigneeType.PERSON)  # 1
 
-        from services.tool_contracts import ToolExecutionContext
         execution_context = ToolExecutionContext(
             user_context=booking_context,
             tool_outputs=(
@@ -498,8 +501,7 @@ class FlowHandler:
                     logger.info(f"GATHERING FALLBACK: Using raw text '{text.strip()}' as {param}")
             # Za Value (kilometraža), pokušaj parsirati broj
             elif param.lower() in ['value', 'mileage']:
-                import re
-                numbers = re.findall(r'\d+', text)
+                numbers = self.NUMBER_PATTERN.findall(text)
                 if numbers:
                     extracted[param] = int(numbers[0])
                     logger.info(f"GATHERING FALLBACK: Extracted number '{numbers[0]}' as {param}")
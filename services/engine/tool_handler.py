@@ -7,11 +7,13 @@ Single responsibility: Execute tools with automatic dependency resolution.
 
 import json
 import logging
+import re
 from typing import Dict, Any, Optional, List
 
 from services.api_capabilities import get_capability_registry
 from services.error_translator import get_error_translator
 from services.tool_evaluator import get_tool_evaluator
+from services.tool_contracts import ToolExecutionContext
 
 logger = logging.getLogger(__name__)
 
@@ -29,6 +31,11 @@ class ToolHandler:
 
     MAX_CHAIN_DEPTH = 3
 
+    # Pre-compiled at class load (Performance optimization) - missing param
+    # names in validation errors ("parametri: VehicleId", "Unesite datum od:")
+    MISSING_PARAM_PATTERN = re.compile(r'parametri?:\s*(\w+)', re.IGNORECASE)
+    MISSING_PARAM_PROMPT_PATTERN = re.compile(r'unesite\s+(\w+(?:\s+\w+)?)\s*:', re.IGNORECASE)
+
     def __init__(
         self,
         registry,
@@ -96,8 +103,6 @@ class ToolHandler:
             }
 
         # Create execution context
-        from services.tool_contracts import ToolExecutionContext
-
         tool_outputs = (
             conv_manager.context.tool_outputs
             if hasattr(conv_manager.context, 'tool_outputs')
@@ -134,12 +139,17 @@ class ToolHandler:
 
                 user_value = self._find_resolvable_value(parameters, missing_param)
 
-                resolution = await self.dependency_resolver.resolve_dependency(
-                    missing_param=missing_param,
-                    user_value=user_value,
-                    user_context=user_context,
-                    executor=self.executor
+                # Cache hits resolve synchronously, no coroutine needed
+                resolution = self.dependency_resolver.try_cached_resolution(
+                    missing_param, user_value, user_context
                 )
+                if resolution is None:
+                    resolution = await self.dependency_resolver.resolve_dependency(
+                        missing_param=missing_param,
+                        user_value=user_value,
+                        user_context=user_context,
+                        executor=self.executor
+                    )
 
                 if resolution.success:
                     parameters[missing_param] = resolution.resolved_value
@@ -360,13 +370,11 @@ class ToolHandler:
         if not error_message:
             return None
 
-        import re
-
-        match = re.search(r'parametri?:\s*(\w+)', error_message, re.IGNORECASE)
+        match = self.MISSING_PARAM_PATTERN.search(error_message)
         if match:
             return match.group(1)
 
-        match = re.search(r'unesite\s+(\w+(?:\s+\w+)?)\s*:', error_message, re.IGNORECASE)
+        match = self.MISSING_PARAM_PROMPT_PATTERN.search(error_message)
         if match:
             parts = match.group(1).split()
             return ''.join(word.capitalize() for word in parts)
@@ -12,6 +12,7 @@ NO domain logic - purely type system operations.
 
 import json
 import logging
+import re
 from typing import Dict, Any, List, Tuple, Optional
 from datetime import datetime, date
 
@@ -74,6 +75,9 @@ class ParameterManager:
     When parameters are missing, ask for ONE parameter at a time with a clear question.
     """
 
+    # Pre-compiled at class load (Performance optimization) - camelCase → words
+    CAMEL_CASE_BOUNDARY = re.compile(r'([a-z])([A-Z])')
+
     # Human-friendly parameter descriptions (Croatian)
     # Used for generating clear, single-parameter questions
     PARAM_DESCRIPTIONS: Dict[str, str] = {
@@ -762,8 +766,7 @@ class ParameterManager:
 
         # Priority 3: Generate question from param name
         # Convert camelCase/PascalCase to readable format
-        import re
-        readable = re.sub(r'([a-z])([A-Z])', r'\1 \2', param_name)
+        readable = self.CAMEL_CASE_BOUNDARY.sub(r'\1 \2', param_name)
         readable = readable.replace("_", " ").lower()
 
         return f"Molim unesite {readable}:"
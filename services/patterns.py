@@ -11,17 +11,95 @@ Version: 1.0
 """
 
 import re
-from typing import Pattern, Dict, List, Any
+from typing import Callable, Pattern, Dict, List, Any, Optional
 from dataclasses import dataclass
 
+try:
+    import re2
+except ImportError:
+    re2 = None
 
-@dataclass
+
+def compile_linear(pattern: Pattern) -> Pattern:
+    """
+    Recompile a pattern with re2 (linear-time DFA) when available.
+
+    Falls back to the original `re` pattern if re2 is not installed
+    or does not support the syntax.
+    """
+    if re2 is None:
+        return pattern
+    source = pattern.pattern
+    if pattern.flags & re.IGNORECASE:
+        source = '(?i)' + source
+    try:
+        return re2.compile(source)
+    except Exception:
+        return pattern
+
+
+def compile_union(patterns: List[Pattern], fold_case: bool = True) -> Optional[Pattern]:
+    """
+    Combine patterns into one alternation with named groups p0, p1, ...
+
+    The first alternative that matches wins, same as trying the patterns
+    in order; match.lastgroup gives its index. Per-pattern IGNORECASE is
+    kept as a scoped (?i:...) group, or dropped with fold_case=False when
+    the caller already case-normalizes its input. Returns None if the
+    patterns cannot be combined (e.g. clashing group names).
+    """
+    parts = []
+    for i, pattern in enumerate(patterns):
+        source = pattern.pattern
+        ignore_case = False
+        if source.startswith('(?i)'):
+            source, ignore_case = source[4:], True
+        elif isinstance(pattern, re.Pattern):
+            ignore_case = bool(pattern.flags & re.IGNORECASE)
+        if ignore_case and fold_case:
+            source = f'(?i:{source})'
+        parts.append(f'(?P<p{i}>{source})')
+
+    try:
+        return compile_linear(re.compile('|'.join(parts)))
+    except re.error:
+        return None
+
+
+# Cheap necessary conditions checked before the regex engine runs.
+# Each must hold for every value its pattern can match (input is stripped).
+# Plate separators (dash; whitespace via split) removed in C before
+# the length/character check
+_PLATE_DASH = str.maketrans('', '', '-')
+
+
+def _plate_prefilter(value: str) -> bool:
+    if not 6 <= len(value) <= 10:
+        return False
+    compact = ''.join(value.translate(_PLATE_DASH).split())
+    return 6 <= len(compact) <= 8 and compact.isalnum()
+
+
+def _vin_prefilter(value: str) -> bool:
+    return len(value) == 17
+
+
+def _email_prefilter(value: str) -> bool:
+    return '@' in value
+
+
+def _phone_prefilter(value: str) -> bool:
+    return 8 <= len(value) <= 14 and (value[0].isdigit() or value[0] == '+')
+
+
+@dataclass(frozen=True, slots=True)
 class ValuePattern:
     """Pattern for recognizing human-readable values."""
     pattern: Pattern
     param_type: str
     filter_field: str
     description: str
+    prefilter: Optional[Callable[[str], bool]] = None
 
 
 class PatternRegistry:
@@ -89,6 +167,12 @@ class PatternRegistry:
     # VALUE PATTERNS (for parameter resolution)
     # ═══════════════════════════════════════════════════════════════
 
+    # Linear-time variants for matching arbitrary user values (no ReDoS)
+    CROATIAN_PLATE_LINEAR = compile_linear(CROATIAN_PLATE)
+    VIN_PATTERN_LINEAR = compile_linear(VIN_PATTERN)
+    EMAIL_PATTERN_LINEAR = compile_linear(EMAIL_PATTERN)
+    CROATIAN_PHONE_LINEAR = compile_linear(CROATIAN_PHONE)
+
     @classmethod
     def get_value_patterns(cls) -> List[ValuePattern]:
         """
@@ -100,28 +184,32 @@ class PatternRegistry:
         # NOTE: param_type values MUST match keys in PARAM_PROVIDERS (lowercase, no underscore)
         return [
             ValuePattern(
-                pattern=cls.CROATIAN_PLATE,
+                pattern=cls.CROATIAN_PLATE_LINEAR,
                 param_type='vehicleid',
                 filter_field='LicencePlate',
-                description='Croatian license plate'
+                description='Croatian license plate',
+                prefilter=_plate_prefilter
             ),
             ValuePattern(
-                pattern=cls.VIN_PATTERN,
+                pattern=cls.VIN_PATTERN_LINEAR,
                 param_type='vehicleid',
                 filter_field='VIN',
-                description='Vehicle VIN'
+                description='Vehicle VIN',
+                prefilter=_vin_prefilter
             ),
             ValuePattern(
-                pattern=cls.EMAIL_PATTERN,
+                pattern=cls.EMAIL_PATTERN_LINEAR,
                 param_type='personid',
                 filter_field='Email',
-                description='Email address'
+                description='Email address',
+                prefilter=_email_prefilter
             ),
             ValuePattern(
-                pattern=cls.CROATIAN_PHONE,
+                pattern=cls.CROATIAN_PHONE_LINEAR,
                 param_type='personid',
                 filter_field='Phone',
-                description='Phone number'
+                description='Phone number',
+                prefilter=_phone_prefilter
             ),
         ]
 
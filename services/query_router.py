@@ -13,6 +13,8 @@ import logging
 from dataclasses import dataclass
 from typing import Dict, Any, Optional, List, Tuple
 
+from services.patterns import compile_union
+
 logger = logging.getLogger(__name__)
 
 
@@ -48,6 +50,18 @@ class QueryRouter:
         """Initialize router with rules."""
         self.rules = self._build_rules()
 
+        # Pre-compiled once (Performance optimization) - route() runs on
+        # every message; (rule, compiled, source) in priority order
+        self._patterns = tuple(
+            (rule, re.compile(p, re.IGNORECASE), p)
+            for rule in self.rules
+            for p in rule["patterns"]
+        )
+
+        # All patterns in one alternation (re2 DFA when installed): one scan
+        # rejects unmatched queries and bounds the ordered check on a hit
+        self._union = compile_union([compiled for _, compiled, _ in self._patterns])
+
     def _build_rules(self) -> List[Dict[str, Any]]:
         """Build deterministic routing rules."""
         return [
@@ -303,23 +317,23 @@ class QueryRouter:
         """
         query_lower = query.lower().strip()
 
-        for rule in self.rules:
-            for pattern in rule["patterns"]:
-                if re.search(pattern, query_lower, re.IGNORECASE):
-                    logger.info(
-                        f"ROUTER: Matched '{query[:30]}...' to {rule['intent']} "
-                        f"→ {rule['tool'] or 'direct_response'}"
-                    )
-
-                    return RouteResult(
-                        matched=True,
-                        tool_name=rule["tool"],
-                        extract_fields=rule["extract_fields"],
-                        response_template=rule["response_template"],
-                        flow_type=rule["flow_type"],
-                        confidence=1.0,
-                        reason=f"Matched pattern: {pattern}"
-                    )
+        position = self._find_pattern(query_lower)
+        if position is not None:
+            rule, _, pattern = self._patterns[position]
+            logger.info(
+                f"ROUTER: Matched '{query[:30]}...' to {rule['intent']} "
+                f"→ {rule['tool'] or 'direct_response'}"
+            )
+
+            return RouteResult(
+                matched=True,
+                tool_name=rule["tool"],
+                extract_fields=rule["extract_fields"],
+                response_template=rule["response_template"],
+                flow_type=rule["flow_type"],
+                confidence=1.0,
+                reason=f"Matched pattern: {pattern}"
+            )
 
         # No exact match - let semantic search handle it
         logger.info(f"ROUTER: No match for '{query[:30]}...' - using semantic search")
@@ -329,6 +343,27 @@ class QueryRouter:
             reason="No pattern matched, no domain detected"
         )
 
+    def _find_pattern(self, query_lower: str) -> Optional[int]:
+        """
+        Position of the first pattern (in priority order) found in the query.
+
+        The union search returns the pattern matching leftmost in the text,
+        not the highest-priority one, so only the patterns before it still
+        need an individual check.
+        """
+        patterns = self._patterns
+        if self._union is None:
+            candidates = len(patterns)
+        else:
+            match = self._union.search(query_lower)
+            if match is None:
+                return None
+            candidates = int(match.lastgroup[1:])
+
+        for position in range(candidates):
+            if patterns[position][1].search(query_lower):
+                return position
+        return candidates if self._union is not None else None
 
     def format_response(
         self,
@@ -127,6 +127,7 @@ class ToolRegistry:
                     for op_id, embedding in cached_data["embeddings"].items():
                         self._store.add_embedding(op_id, embedding)
 
+                    self._search.prepare_embeddings(self._store.embeddings)
                     self.is_ready = True
                     logger.info(
                         f"✅ Loaded {self._store.count()} tools from cache "
@@ -173,6 +174,7 @@ class ToolRegistry:
                     list(self._store.dependency_graph.values())
                 )
 
+                self._search.prepare_embeddings(self._store.embeddings)
                 self.is_ready = True
                 logger.info(
                     f"✅ Initialized {self._store.count()} tools "
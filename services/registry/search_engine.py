@@ -11,11 +11,11 @@ import os
 import re
 from typing import Dict, List, Set, Tuple, Any, Optional
 
-from openai import AsyncAzureOpenAI
+import numpy as np
 
 from config import get_settings
+from services.embedding_service import get_embedding
 from services.tool_contracts import UnifiedToolDefinition, DependencyGraph
-from services.scoring_utils import cosine_similarity
 from services.patterns import (
     READ_INTENT_PATTERNS,
     MUTATION_INTENT_PATTERNS,
@@ -91,13 +91,7 @@ class SearchEngine:
     }
 
     def __init__(self):
-        """Initialize search engine with OpenAI client and category data."""
-        self.openai = AsyncAzureOpenAI(
-            azure_endpoint=settings.AZURE_OPENAI_ENDPOINT,
-            api_key=settings.AZURE_OPENAI_API_KEY,
-            api_version=settings.AZURE_OPENAI_API_VERSION
-        )
-
+        """Initialize search engine with category data."""
         # Load category and documentation data
         self._tool_categories = _load_json_file("tool_categories.json")
         self._tool_documentation = _load_json_file("tool_documentation.json")
@@ -133,8 +127,70 @@ class SearchEngine:
                                   self._training_queries.get("training_data", [])))
             logger.info(f"🎯 Loaded {training_count} training examples")
 
+        # Tool embeddings as one L2-normalized float32 matrix (see
+        # prepare_embeddings); keyed by the embeddings dict (id, size)
+        self._matrix_key: Optional[Tuple[int, int]] = None
+        self._matrix_index: Dict[str, int] = {}
+        self._matrix: Optional[np.ndarray] = None
+
         logger.debug("SearchEngine initialized (v2.0 with categories)")
 
+    def prepare_embeddings(self, embeddings: Dict[str, List[float]]) -> None:
+        """
+        Stack tool embeddings into a normalized matrix for similarity search.
+
+        Called once after the registry loads; searches rebuild it lazily
+        if the embeddings dict changes size. Embeddings whose dimension
+        differs from the first one are left out (similarity 0).
+        """
+        index: Dict[str, int] = {}
+        rows: List[List[float]] = []
+        dim = None
+        for op_id, embedding in embeddings.items():
+            if not embedding:
+                continue
+            if dim is None:
+                dim = len(embedding)
+            if len(embedding) != dim:
+                continue
+            index[op_id] = len(rows)
+            rows.append(embedding)
+
+        matrix = np.asarray(rows, dtype=np.float32).reshape(len(rows), dim or 0)
+        norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+        norms[norms == 0] = 1.0
+        matrix /= norms
+
+        self._matrix_key = (id(embeddings), len(embeddings))
+        self._matrix_index = index
+        self._matrix = matrix
+        logger.info(f"🧮 Prepared embedding matrix {matrix.shape}")
+
+    def _score_pool(
+        self,
+        query_embedding: List[float],
+        embeddings: Dict[str, List[float]],
+        search_pool: Set[str],
+        min_score: float
+    ) -> List[Tuple[float, str]]:
+        """Cosine similarity of pool tools to the query (one matmul), >= min_score."""
+        if self._matrix_key != (id(embeddings), len(embeddings)):
+            self.prepare_embeddings(embeddings)
+
+        query = np.asarray(query_embedding, dtype=np.float32)
+        norm = np.linalg.norm(query)
+        if norm == 0 or query.shape[0] != self._matrix.shape[1]:
+            return []
+
+        similarities = (self._matrix @ (query / norm)).tolist()
+        index = self._matrix_index
+        scored = []
+        for op_id in search_pool:
+            row = index.get(op_id)
+            if row is not None and similarities[row] >= min_score:
+                scored.append((similarities[row], op_id))
+        return scored
+
     async def find_relevant_tools_with_scores(
         self,
         query: str,
@@ -184,16 +240,9 @@ class SearchEngine:
 
         # Calculate similarity scores
         lenient_threshold = max(0.40, threshold - 0.20)
-        scored = []
-
-        for op_id in search_pool:
-            if op_id not in embeddings:
-                continue
-
-            similarity = cosine_similarity(query_embedding, embeddings[op_id])
-
-            if similarity >= lenient_threshold:
-                scored.append((similarity, op_id))
+        scored = self._score_pool(
+            query_embedding, embeddings, search_pool, lenient_threshold
+        )
 
         # Apply scoring adjustments
         scored = self._apply_method_disambiguation(query, scored, tools)
@@ -241,16 +290,13 @@ class SearchEngine:
         return result
 
     async def _get_query_embedding(self, query: str) -> Optional[List[float]]:
-        """Get embedding for query text."""
-        try:
-            response = await self.openai.embeddings.create(
-                input=[query[:8000]],
-                model=settings.AZURE_OPENAI_EMBEDDING_DEPLOYMENT
-            )
-            return response.data[0].embedding
-        except Exception as e:
-            logger.warning(f"Query embedding error: {e}")
-            return None
+        """
+        Get embedding for query text.
+
+        Goes through the shared embedding cache, so a message already
+        embedded by the intelligent router is not embedded again.
+        """
+        return await get_embedding(query)
 
     def _apply_method_disambiguation(
         self,
@@ -851,16 +897,9 @@ class SearchEngine:
 
         # Calculate similarity scores on filtered pool
         lenient_threshold = max(0.40, threshold - 0.20)
-        scored = []
-
-        for op_id in search_pool:
-            if op_id not in embeddings:
-                continue
-
-            similarity = cosine_similarity(query_embedding, embeddings[op_id])
-
-            if similarity >= lenient_threshold:
-                scored.append((similarity, op_id))
+        scored = self._score_pool(
+            query_embedding, embeddings, search_pool, lenient_threshold
+        )
 
         # Apply scoring adjustments (boosts, not filters)
         scored = self._apply_method_disambiguation(query, scored, tools)
@@ -8,6 +8,7 @@ NEVER fabricate data - only return what exists in the response.
 
 import json
 import logging
+import re
 from typing import Dict, Any, Optional, List
 
 from openai import AsyncAzureOpenAI
@@ -17,6 +18,34 @@ from config import get_settings
 logger = logging.getLogger(__name__)
 settings = get_settings()
 
+# Max list items re-sent to the LLM (the rest is summarized by count)
+LLM_MAX_LIST_ITEMS = 25
+
+# Values carrying no information for the LLM
+_EMPTY_VALUES = (None, "", [], {})
+
+
+def slim_for_llm(data: Any) -> Any:
+    """
+    Shrink an API response before it is sent to the LLM.
+
+    Drops null/empty fields (recursively) and keeps only the first
+    LLM_MAX_LIST_ITEMS items of each list, so prompt tokens are spent
+    on actual data.
+    """
+    if isinstance(data, dict):
+        return {
+            key: slim_for_llm(value)
+            for key, value in data.items()
+            if value not in _EMPTY_VALUES
+        }
+    if isinstance(data, list):
+        slim = [slim_for_llm(item) for item in data[:LLM_MAX_LIST_ITEMS]]
+        if len(data) > LLM_MAX_LIST_ITEMS:
+            slim.append(f"... (+{len(data) - LLM_MAX_LIST_ITEMS})")
+        return slim
+    return data
+
 
 class LLMResponseExtractor:
     """
@@ -29,6 +58,10 @@ class LLMResponseExtractor:
     4. Handle both simple and nested responses
     """
 
+    # Pre-compiled at class load (Performance optimization) - hallucination checks
+    VEHICLE_COUNT_PATTERN = re.compile(r'(\d+)\s*(vozil|auto)')
+    PLATE_PATTERN = re.compile(r'[A-Z]{2,3}[-\s]?\d{3,4}[-\s]?[A-Z]{1,2}')
+
     def __init__(self):
         """Initialize with OpenAI client."""
         self.openai = AsyncAzureOpenAI(
@@ -219,12 +252,10 @@ Izvuci SAMO ono što korisnik traži. Budi koncizan."""
 
         Logs warnings if potential hallucinations are detected.
         """
-        import re
-
         # Check for suspicious patterns that might indicate hallucination
 
         # 1. Check for vehicle count claims
-        count_match = re.search(r'(\d+)\s*(vozil|auto)', extracted.lower())
+        count_match = self.VEHICLE_COUNT_PATTERN.search(extracted.lower())
         if count_match:
             claimed_count = int(count_match.group(1))
             # Check if Data field exists with actual count
@@ -238,7 +269,7 @@ Izvuci SAMO ono što korisnik traži. Budi koncizan."""
                     )
 
         # 2. Check for registration plates not in original data
-        plate_matches = re.findall(r'[A-Z]{2,3}[-\s]?\d{3,4}[-\s]?[A-Z]{1,2}', extracted)
+        plate_matches = self.PLATE_PATTERN.findall(extracted)
         if plate_matches:
             data_str = json.dumps(original_data).upper()
             for plate in plate_matches:
@@ -0,0 +1,82 @@
+"""
+Tests for ChainPlanner plan caching
+Version: 1.0
+
+Tests the bounded, TTL'd cache of LLM plans.
+"""
+
+from types import SimpleNamespace
+
+import pytest
+from unittest.mock import AsyncMock, MagicMock
+
+from services import chain_planner
+from services.chain_planner import ChainPlanner
+
+
+class TestChainPlannerCache:
+    """Test ChainPlanner._plan_cache_* helpers."""
+
+    PLAN = {"understanding": "Kilometraža", "primary_path": [{"step": 1}]}
+
+    @pytest.fixture
+    def clock(self, monkeypatch):
+        """Controllable monotonic clock for the planner module."""
+        now = [1000.0]
+        monkeypatch.setattr(chain_planner, "time", SimpleNamespace(monotonic=lambda: now[0]))
+        return now
+
+    @pytest.fixture
+    def planner(self, clock):
+        """ChainPlanner with a fake clock."""
+        return ChainPlanner()
+
+    def test_hit_returns_fresh_copy(self, planner):
+        """A cached plan is returned as a new dict on every hit."""
+        planner._plan_cache_put("k", self.PLAN)
+
+        first = planner._plan_cache_get("k")
+        first["primary_path"].clear()
+
+        assert planner._plan_cache_get("k") == self.PLAN
+
+    def test_key_normalizes_query(self):
+        """Case and whitespace differences share a key; other inputs do not."""
+        key = ChainPlanner._plan_cache_key("Moja  kilometraža ", "ctx", "tools")
+
+        assert ChainPlanner._plan_cache_key("moja kilometraža", "ctx", "tools") == key
+        assert ChainPlanner._plan_cache_key("moja kilometraža", "other", "tools") != key
+
+    def test_entry_expires_after_ttl(self, planner, clock):
+        """Entries older than PLAN_CACHE_TTL are dropped on lookup."""
+        planner._plan_cache_put("k", self.PLAN)
+
+        clock[0] += planner.PLAN_CACHE_TTL - 1
+        assert planner._plan_cache_get("k") == self.PLAN
+
+        clock[0] += 1
+        assert planner._plan_cache_get("k") is None
+        assert "k" not in planner._plan_cache
+
+    def test_least_recently_used_evicted(self, planner):
+        """Past PLAN_CACHE_SIZE the least recently used plan is evicted."""
+        planner.PLAN_CACHE_SIZE = 2
+        planner._plan_cache_put("a", self.PLAN)
+        planner._plan_cache_put("b", self.PLAN)
+        planner._plan_cache_get("a")
+
+        planner._plan_cache_put("c", self.PLAN)
+
+        assert list(planner._plan_cache) == ["a", "c"]
+
+    async def test_create_plan_reuses_llm_plan(self, planner):
+        """A repeated query is planned from the cache without the LLM."""
+        planner._check_simple_cases = MagicMock(return_value=None)
+        planner._get_plan_from_llm = AsyncMock(return_value=self.PLAN)
+        planner._parse_plan_response = MagicMock(side_effect=lambda plan, scores: plan)
+
+        first = await planner.create_plan("Kilometraža?", {}, [], [])
+        second = await planner.create_plan("  kilometraža? ", {}, [], [])
+
+        assert first == second == self.PLAN
+        planner._get_plan_from_llm.assert_awaited_once()
@@ -0,0 +1,643 @@
+"""
+Tests for DependencyResolver
+Version: 1.0
+
+Tests value detection, filter construction and entity resolution.
+"""
+
+import httpx
+import pytest
+from unittest.mock import AsyncMock, MagicMock
+from services.dependency_resolver import DependencyResolver, EntityReference
+
+
+class TestDependencyResolver:
+    """Test DependencyResolver class."""
+
+    @pytest.fixture
+    def registry(self):
+        """Mock tool registry with no tools loaded."""
+        registry = MagicMock()
+        registry.tools = {}
+        registry.dependency_graph = {}
+        registry.get_tool = MagicMock(return_value=None)
+        return registry
+
+    @pytest.fixture
+    def resolver(self, registry):
+        return DependencyResolver(registry)
+
+    # ========================================================================
+    # FILTER QUERY
+    # ========================================================================
+
+    def test_build_filter_query_known_field(self, resolver):
+        """Known filter fields use the precomputed template."""
+        result = resolver.build_filter_query("LicencePlate", "  ZG-1234-AB ")
+
+        assert result == {"Filter": "LicencePlate(=)ZG-1234-AB"}
+
+    def test_build_filter_query_unknown_field(self, resolver):
+        """Unknown filter fields fall back to the same format."""
+        result = resolver.build_filter_query("Name", "Golf")
+
+        assert result == {"Filter": "Name(=)Golf"}
+
+    def test_build_filter_query_percent_in_value(self, resolver):
+        """Values containing % must not break template substitution."""
+        result = resolver.build_filter_query("Email", "a%b@example.com")
+
+        assert result == {"Filter": "Email(=)a%b@example.com"}
+
+    # ========================================================================
+    # PROVIDER TOOL FIXTURES
+    # ========================================================================
+
+    @pytest.fixture
+    def vehicle_tool(self):
+        """Provider tool that returns vehicles and accepts a Filter."""
+        tool = MagicMock()
+        tool.method = "GET"
+        tool.output_keys = ["Id", "LicencePlate"]
+        tool.parameters = {"Filter": MagicMock(context_key=None)}
+        return tool
+
+    @pytest.fixture
+    def vehicle_registry(self, registry, vehicle_tool):
+        registry.tools = {"get_Vehicles": vehicle_tool}
+        registry.get_tool = MagicMock(return_value=vehicle_tool)
+        return registry
+
+    # ========================================================================
+    # ID EXTRACTION
+    # ========================================================================
+
+    def test_extract_id_for_tool_learns_path(self, resolver):
+        """First extraction learns the path, later ones reuse it."""
+        data = {"Items": [{"VehicleId": "v-1", "Name": "Golf"}]}
+
+        assert resolver._extract_id_for_tool(data, "VehicleId", "get_Vehicles") == "v-1"
+        assert ("get_Vehicles", "VehicleId") in resolver._extractor_cache
+
+        data = {"Items": [{"VehicleId": "v-2"}]}
+        assert resolver._extract_id_for_tool(data, "VehicleId", "get_Vehicles") == "v-2"
+
+    def test_extract_id_for_tool_relearns_on_shape_change(self, resolver):
+        """A miss on the learned path falls back to the generic search."""
+        resolver._extract_id_for_tool({"Data": {"Id": "v-1"}}, "VehicleId", "get_Vehicles")
+
+        assert resolver._extract_id_for_tool([{"Id": "v-2"}], "VehicleId", "get_Vehicles") == "v-2"
+        assert resolver._extract_id_for_tool([{"Id": "v-3"}], "VehicleId", "get_Vehicles") == "v-3"
+
+    # ========================================================================
+    # CACHING
+    # ========================================================================
+
+    @pytest.mark.asyncio
+    async def test_resolution_cache_scoped_per_user(self, vehicle_registry):
+        """Cached resolutions are not shared between users or tenants."""
+        resolver = DependencyResolver(vehicle_registry)
+        executor = MagicMock()
+        executor.execute = AsyncMock(side_effect=[
+            MagicMock(success=True, data=[{"Id": "v-1"}]),
+            MagicMock(success=True, data=[{"Id": "v-2"}]),
+        ])
+        alice = {"tenant_id": "t-1", "person_id": "p-1"}
+        bob = {"tenant_id": "t-2", "person_id": "p-2"}
+
+        first = await resolver.resolve_dependency("VehicleId", "ZG-1234-AB", alice, executor)
+        second = await resolver.resolve_dependency("VehicleId", "ZG-1234-AB", bob, executor)
+        cached = await resolver.resolve_dependency("VehicleId", "ZG-1234-AB", alice, executor)
+
+        assert (first.resolved_value, second.resolved_value) == ("v-1", "v-2")
+        assert cached.resolved_value == "v-1"
+        assert executor.execute.await_count == 2
+
+    @pytest.mark.asyncio
+    async def test_resolve_many_shares_inflight_requests(self, vehicle_registry):
+        """Concurrent identical resolutions share one provider call."""
+        resolver = DependencyResolver(vehicle_registry)
+        executor = MagicMock()
+        executor.execute = AsyncMock(return_value=MagicMock(success=True, data=[{"Id": "v-1"}]))
+        user = {"person_id": "p-1"}
+
+        results = await resolver.resolve_many(
+            [("VehicleId", "ZG-1234-AB"), ("VehicleId", "ZG-1234-AB")], user, executor
+        )
+
+        assert [r.resolved_value for r in results] == ["v-1", "v-1"]
+        assert executor.execute.await_count == 1
+        assert resolver._inflight == {}
+
+    # ========================================================================
+    # ENTITY REFERENCE DETECTION
+    # ========================================================================
+
+    @pytest.mark.parametrize("text,index", [
+        ("Dodaj km na Vozilo 1", 0),
+        ("unesi kilometražu za auto 3", 2),
+        ("my car 2 please", 1),
+        ("#2 vozilo", 1),
+        ("ne vozilo 0 nego auto 2", 1),
+        ("#3 vozilo, ne auto 1", 2),
+        ("automobil   4", 3),
+    ])
+    def test_detect_ordinal_reference(self, resolver, text, index):
+        """Ordinal references map to 0-indexed positions."""
+        ref = resolver.detect_entity_reference(text)
+
+        assert ref.reference_type == "ordinal"
+        assert ref.ordinal_index == index
+
+    @pytest.mark.parametrize("text", [
+        "Koja je kilometraža na mom vozilu",
+        "moje vozilo treba servis",
+        "MY CAR is broken",
+    ])
+    def test_detect_possessive_reference(self, resolver, text):
+        """Possessive references resolve to the user's vehicle."""
+        ref = resolver.detect_entity_reference(text)
+
+        assert ref.reference_type == "possessive"
+        assert ref.is_possessive
+
+    @pytest.mark.parametrize("triggers,patterns", [
+        (DependencyResolver.ORDINAL_TRIGGERS, DependencyResolver._ORDINAL_RESIDUAL),
+        (DependencyResolver.POSSESSIVE_TRIGGERS, DependencyResolver.POSSESSIVE_PATTERNS),
+    ])
+    def test_every_pattern_has_a_trigger(self, triggers, patterns):
+        """Each regex pattern starts with one of its type's trigger literals."""
+        for pattern, entity_type in patterns:
+            assert pattern.startswith(triggers[entity_type]), pattern
+
+    @pytest.mark.parametrize("text", [
+        "",
+        "Koje vozilo je dostupno?",
+        "vozilo 0",
+    ])
+    def test_detect_no_reference(self, resolver, text):
+        """Plain mentions and invalid ordinals are not references."""
+        assert resolver.detect_entity_reference(text) is None
+
+    def test_detect_all_entity_references(self, resolver):
+        """All entity types are detected from one normalized text."""
+        refs = resolver.detect_all_entity_references("  Vozilo 2 ")
+
+        assert list(refs) == ["vehicle"]
+        assert refs["vehicle"] is resolver.detect_entity_reference("vozilo 2")
+        assert resolver.detect_all_entity_references("dobar dan") == {}
+
+    def test_detection_memoized(self, resolver):
+        """Repeated detections on the same normalized text hit the cache."""
+        first = resolver.detect_entity_reference("Vozilo 2")
+        second = resolver.detect_entity_reference("  vozilo 2 ")
+
+        assert first is second
+        assert resolver._detect_entity_reference_cached.cache_info().hits == 1
+
+        resolver.detect_value_type("zg-1234-ab")
+        assert resolver.detect_value_type("ZG-1234-AB ") == ("vehicleid", "LicencePlate")
+        assert resolver._detect_value_type_cached.cache_info().hits == 1
+
+    # ========================================================================
+    # PROVIDER LOOKUP
+    # ========================================================================
+
+    @staticmethod
+    def _tool(method, output_keys):
+        tool = MagicMock()
+        tool.method = method
+        tool.output_keys = output_keys
+        tool.parameters = {}
+        return tool
+
+    def test_find_provider_tool_by_output_keys(self, registry, resolver):
+        """First GET tool in registry order providing an expected key wins."""
+        registry.tools = {
+            "post_Vehicles": self._tool("POST", ["Id"]),
+            "get_Trips": self._tool("GET", ["TripId"]),
+            "get_VehicleList": self._tool("GET", ["VehicleId"]),
+            "get_Masterdata": self._tool("GET", ["Id"]),
+        }
+
+        assert resolver.find_provider_tool("VehicleId") == "get_VehicleList"
+
+    def test_find_provider_tool_sees_late_registered_tools(self, registry, resolver):
+        """Index is rebuilt when tools are loaded after the resolver."""
+        assert resolver.find_provider_tool("PersonId") is None
+
+        registry.tools["get_Persons"] = self._tool("GET", ["PersonId"])
+
+        assert resolver.find_provider_tool("person_id") == "get_Persons"
+
+    def test_find_provider_tool_memoized(self, registry, resolver):
+        """Repeated lookups for the same param skip the search."""
+        registry.tools = {"get_Vehicles": self._tool("GET", ["VehicleId"])}
+
+        assert resolver.find_provider_tool("VehicleId") == "get_Vehicles"
+        resolver._lookup_provider_tool = MagicMock()
+        assert resolver.find_provider_tool("VehicleId") == "get_Vehicles"
+        resolver._lookup_provider_tool.assert_not_called()
+
+        resolver.clear_cache()
+        resolver.find_provider_tool("VehicleId")
+        resolver._lookup_provider_tool.assert_called_once_with("VehicleId")
+
+    def test_resolution_cache_bounded_lru(self, resolver):
+        """Resolution cache evicts the least recently used entry."""
+        resolver.RESOLUTION_CACHE_SIZE = 2
+        resolver._cache_put(("a",), {"value": 1})
+        resolver._cache_put(("b",), {"value": 2})
+        resolver._cache_get(("a",))
+        resolver._cache_put(("c",), {"value": 3})
+
+        assert list(resolver._resolution_cache) == [("a",), ("c",)]
+
+    @pytest.mark.parametrize("data,expected", [
+        ({"Id": "1"}, "1"),
+        ({"vehicleid": "2", "Id": "x"}, "2"),
+        ({"Id": "x", "VehicleId": "6"}, "6"),
+        ({"ID": "", "id": "3"}, "3"),
+        ({"Data": [{"VehicleId": "4"}]}, "4"),
+        ([{"Name": "Golf", "id": "5"}], "5"),
+        ({"Name": "Golf"}, None),
+    ])
+    def test_extract_id_from_result(self, resolver, data, expected):
+        """ID keys are matched case-insensitively in priority order."""
+        assert resolver._extract_id_from_result(data, "VehicleId") == expected
+
+    @pytest.mark.asyncio
+    async def test_try_cached_resolution(self, vehicle_registry):
+        """Sync cache probe returns None on miss and the result on hit."""
+        resolver = DependencyResolver(vehicle_registry)
+        executor = MagicMock()
+        executor.execute = AsyncMock(return_value=MagicMock(
+            success=True, data=[{"Id": "v-1"}]
+        ))
+        user = {"tenant_id": "t-1", "person_id": "p-1"}
+
+        assert resolver.try_cached_resolution("VehicleId", "ZG-1234-AB", user) is None
+        await resolver.resolve_dependency("VehicleId", "ZG-1234-AB", user, executor)
+
+        cached = resolver.try_cached_resolution("VehicleId", "ZG-1234-AB", user)
+        assert cached.success and cached.resolved_value == "v-1"
+        assert resolver.try_cached_resolution("VehicleId", "ZG-1234-AB", {}) is None
+
+    def test_person_id_param_cached_per_tool(self, resolver):
+        """The person_id parameter scan runs once per tool."""
+        tool = MagicMock()
+        tool.operation_id = "get_Vehicles"
+        tool.parameters = {
+            "Filter": MagicMock(context_key=None),
+            "PersonId": MagicMock(context_key="person_id"),
+        }
+
+        params = {}
+        resolver._inject_person_filter(tool, params, {"person_id": "p-1"})
+        assert params == {"PersonId": "p-1"}
+
+        tool.parameters = {}
+        assert resolver._person_id_param_for(tool) == "PersonId"
+
+        # Registry reload (new tools dict) invalidates the learned parameter
+        resolver.registry.tools = {}
+        resolver.find_provider_tool("VehicleId")
+        assert resolver._person_id_param_for(tool) is None
+
+    def test_find_provider_tool_by_name_skips_mutations(self, registry, resolver):
+        """Name matching ignores tools whose names mark them as mutating."""
+        registry.tools = {
+            "get_DeleteVehicleCache": self._tool("GET", []),
+            "get_VehicleOverview": self._tool("GET", []),
+        }
+
+        assert resolver.find_provider_tool("VehicleId") == "get_VehicleOverview"
+
+    def test_value_patterns_built_once(self, resolver):
+        """VALUE_PATTERNS is cached on the instance."""
+        assert resolver.VALUE_PATTERNS is resolver.VALUE_PATTERNS
+
+    def test_value_union_shared_between_instances(self, registry, resolver):
+        """All resolvers share one compiled value union."""
+        assert DependencyResolver(registry)._value_union is resolver._value_union
+
+    @pytest.mark.asyncio
+    async def test_possessive_without_default_uses_first_vehicle(self, vehicle_registry):
+        """Possessive reference falls back to the first listed vehicle."""
+        resolver = DependencyResolver(vehicle_registry)
+        executor = MagicMock()
+        executor.execute = AsyncMock(return_value=MagicMock(
+            success=True,
+            data=[{"Id": "v-1", "Name": "Golf"}, {"Id": "v-2", "Name": "Passat"}]
+        ))
+        reference = resolver.detect_entity_reference("moje vozilo")
+
+        result = await resolver.resolve_entity_reference(reference, {"person_id": "p-1"}, executor)
+
+        assert result.success
+        assert result.resolved_value == "v-1"
+        assert result.provider_params == {"ordinal": 1}
+
+    @pytest.mark.asyncio
+    async def test_ordinal_reuses_vehicle_list(self, vehicle_registry):
+        """Different ordinals from one user share one vehicle list fetch."""
+        resolver = DependencyResolver(vehicle_registry)
+        executor = MagicMock()
+        executor.execute = AsyncMock(return_value=MagicMock(
+            success=True,
+            data=[{"Id": "v-1", "Name": "Golf"}, {"Id": "v-2", "Name": "Passat"}]
+        ))
+        user = {"person_id": "p-1"}
+
+        first = await resolver.resolve_entity_reference(
+            resolver.detect_entity_reference("vozilo 1"), user, executor
+        )
+        second = await resolver.resolve_entity_reference(
+            resolver.detect_entity_reference("vozilo 2"), user, executor
+        )
+
+        assert (first.resolved_value, second.resolved_value) == ("v-1", "v-2")
+        assert executor.execute.await_count == 1
+        assert user == {"person_id": "p-1"}
+
+        # Another user's ordinal never reuses this list
+        await resolver.resolve_entity_reference(
+            resolver.detect_entity_reference("vozilo 2"), {"person_id": "p-2"}, executor
+        )
+        assert executor.execute.await_count == 2
+
+    @pytest.mark.asyncio
+    async def test_vehicle_list_cache_expires(self, vehicle_registry):
+        """Cached vehicle lists are dropped after VEHICLE_LIST_TTL."""
+        resolver = DependencyResolver(vehicle_registry)
+        user = {"tenant_id": "t-1", "person_id": "p-1"}
+        resolver._store_vehicle_list(user, "get_Vehicles", [{"Id": "v-1"}])
+
+        assert resolver._get_cached_vehicle_list(user, "get_Vehicles") == [{"Id": "v-1"}]
+        assert resolver._get_cached_vehicle_list({"person_id": "p-1"}, "get_Vehicles") is None
+
+        key = ("t-1", "p-1", "get_Vehicles")
+        fetched_at, vehicles = resolver._vehicle_list_cache[key]
+        resolver._vehicle_list_cache[key] = (fetched_at - resolver.VEHICLE_LIST_TTL, vehicles)
+        assert resolver._get_cached_vehicle_list(user, "get_Vehicles") is None
+
+    @pytest.mark.asyncio
+    async def test_ordinal_resolution_cached(self, vehicle_registry):
+        """Repeated ordinal reference from the same user skips the provider call."""
+        resolver = DependencyResolver(vehicle_registry)
+        executor = MagicMock()
+        executor.execute = AsyncMock(return_value=MagicMock(
+            success=True,
+            data=[{"Id": "v-1", "Name": "Golf"}, {"Id": "v-2", "Name": "Passat"}]
+        ))
+        reference = resolver.detect_entity_reference("vozilo 2")
+
+        first = await resolver.resolve_entity_reference(reference, {"person_id": "p-1"}, executor)
+        second = await resolver.resolve_entity_reference(reference, {"person_id": "p-1"}, executor)
+
+        assert executor.execute.await_count == 1
+        assert second.resolved_value == first.resolved_value == "v-2"
+        assert second.feedback == first.feedback
+
+        # Ordinals live only as long as the list they index into
+        for key, (fetched_at, vehicles) in list(resolver._vehicle_list_cache.items()):
+            resolver._vehicle_list_cache[key] = (fetched_at - resolver.VEHICLE_LIST_TTL, vehicles)
+        await resolver.resolve_entity_reference(reference, {"person_id": "p-1"}, executor)
+        assert executor.execute.await_count == 2
+
+    # ========================================================================
+    # FUZZY VEHICLE MATCH
+    # ========================================================================
+
+    VEHICLES = [
+        {"Id": "v-1", "Name": "Passat", "LicencePlate": "ZG-1111-AA"},
+        {"Id": "v-2", "FullVehicleName": "VW Golf 8", "LicencePlate": "ST-2222-BB"},
+    ]
+
+    @pytest.mark.parametrize("term,expected", [
+        ("golf", "v-2"),
+        ("Passat", "v-1"),
+        ("ST-2222-BB", "v-2"),
+        ("tesla", None),
+    ])
+    def test_fuzzy_match_vehicle(self, resolver, term, expected):
+        """Vehicles match by name or plate, unrelated terms do not."""
+        vehicle = resolver._fuzzy_match_vehicle(self.VEHICLES, term)
+
+        assert (vehicle["Id"] if vehicle else None) == expected
+
+    def test_fuzzy_match_vehicle_tolerates_typos(self, resolver):
+        """RapidFuzz scoring matches misspelled names."""
+        assert resolver._fuzzy_match_vehicle(self.VEHICLES, "Pasat")["Id"] == "v-1"
+
+    @pytest.mark.parametrize("term,expected", [
+        ("zg-1111", "v-1"),
+        ("golf 7", "v-2"),
+    ])
+    def test_fuzzy_match_partial_terms(self, resolver, term, expected):
+        """Partial plates and names with extra words still score above the cutoff."""
+        vehicle = resolver._fuzzy_match_vehicle(self.VEHICLES, term)
+
+        assert (vehicle["Id"] if vehicle else None) == expected
+
+    def test_fuzzy_match_prefers_exact_name(self, resolver):
+        """An exact name wins over an earlier vehicle containing it."""
+        vehicles = [{"Id": "v-1", "Name": "VW Golf"}, {"Id": "v-2", "Name": "Golf"}]
+
+        assert resolver._fuzzy_match_vehicle(vehicles, " golf ")["Id"] == "v-2"
+
+    def test_fuzzy_match_cached_per_stored_list(self, resolver):
+        """Repeated matches on the same stored list reuse the cached position."""
+        resolver._match_vehicle = MagicMock(side_effect=lambda vehicles, *args: vehicles[1])
+        list_key = ("t-1", "p-1", "get_Vehicles", 1.0)
+
+        first = resolver._fuzzy_match_vehicle(self.VEHICLES, "golf", list_key)
+        second = resolver._fuzzy_match_vehicle(self.VEHICLES, "golf", list_key)
+
+        assert first["Id"] == "v-2"
+        assert second is self.VEHICLES[1]
+        resolver._match_vehicle.assert_called_once()
+
+        # Lists that were not stored are matched every time
+        resolver._fuzzy_match_vehicle(self.VEHICLES, "golf")
+        assert resolver._match_vehicle.call_count == 2
+
+    def test_fuzzy_match_cache_sees_refetched_list(self, resolver):
+        """A re-stored list gets a new key, so renamed vehicles are matched afresh."""
+        user = {"tenant_id": "t-1", "person_id": "p-1"}
+        resolver._store_vehicle_list(
+            user, "get_Vehicles", [{"Id": "v-1", "Name": "Passat"}, {"Id": "v-2", "Name": "Golf"}]
+        )
+        list_key, vehicles = resolver._get_cached_vehicle_entry(user, "get_Vehicles")
+        assert list_key[:3] == ("t-1", "p-1", "get_Vehicles")
+        assert resolver._fuzzy_match_vehicle(vehicles, "golf", list_key)["Id"] == "v-2"
+
+        resolver._store_vehicle_list(
+            user, "get_Vehicles", [{"Id": "v-1", "Name": "Golf"}, {"Id": "v-2", "Name": "Polo"}]
+        )
+        stored_at, renamed = resolver._vehicle_list_cache[list_key[:3]]
+        resolver._vehicle_list_cache[list_key[:3]] = (stored_at + 1, renamed)
+        new_key, renamed = resolver._get_cached_vehicle_entry(user, "get_Vehicles")
+
+        assert new_key != list_key
+        assert resolver._fuzzy_match_vehicle(renamed, "golf", new_key)["Id"] == "v-1"
+
+    @pytest.mark.parametrize("data,expected", [
+        ([{"Id": "1"}], [{"Id": "1"}]),
+        ({"value": [{"Id": "2"}]}, [{"Id": "2"}]),
+        ({"Data": {"x": 1}, "Items": [{"Id": "3"}]}, [{"Id": "3"}]),
+        ({"Id": "4", "Name": "Golf"}, [{"Id": "4", "Name": "Golf"}]),
+        ({"Name": "Golf"}, []),
+        (None, []),
+    ])
+    def test_extract_vehicle_list(self, resolver, data, expected):
+        """Vehicle lists are unwrapped from the known response shapes."""
+        assert resolver._extract_vehicle_list(data) == expected
+
+    def test_get_provider_tool_memoized(self, vehicle_registry):
+        """Provider tool definition is fetched from the registry once."""
+        resolver = DependencyResolver(vehicle_registry)
+
+        first = resolver._get_provider_tool("VehicleId")
+        second = resolver._get_provider_tool("VehicleId")
+
+        assert first == second == ("get_Vehicles", vehicle_registry.tools["get_Vehicles"])
+        vehicle_registry.get_tool.assert_called_once_with("get_Vehicles")
+
+    @pytest.mark.parametrize("term,expected", [("Pasat 7", "v-7"), ("tesla", None)])
+    def test_fuzzy_match_large_list_batched(self, resolver, term, expected):
+        """Long vehicle lists are scored in one batch with the same result."""
+        vehicles = [
+            {"Id": f"v-{i}", "Name": f"Passat {i}" if i == 7 else f"Octavia {i}"}
+            for i in range(resolver.FUZZY_BATCH_MIN_CHOICES + 10)
+        ]
+
+        vehicle = resolver._fuzzy_match_rapidfuzz(vehicles, term)
+
+        assert (vehicle["Id"] if vehicle else None) == expected
+
+    @pytest.mark.asyncio
+    async def test_remote_error_returns_failure(self, vehicle_registry):
+        """Provider network errors become a failed resolution."""
+        resolver = DependencyResolver(vehicle_registry)
+        executor = MagicMock()
+        executor.execute = AsyncMock(side_effect=httpx.ConnectError("down"))
+
+        result = await resolver.resolve_dependency("VehicleId", "ZG-1234-AB", {}, executor)
+
+        assert not result.success
+        assert "down" in result.error_message
+
+    @pytest.mark.asyncio
+    async def test_name_search_empty_filter_fetches_all(self, vehicle_registry):
+        """An empty filtered result triggers one unfiltered fetch."""
+        resolver = DependencyResolver(vehicle_registry)
+        executor = MagicMock()
+        executor.execute = AsyncMock(side_effect=[
+            MagicMock(success=True, data=[]),
+            MagicMock(success=True, data=[{"Id": "v-2", "Name": "Golf"}]),
+        ])
+        reference = EntityReference("vehicle", "name", "Golf")
+
+        result = await resolver.resolve_entity_reference(reference, {}, executor)
+
+        assert result.resolved_value == "v-2"
+        assert executor.execute.await_count == 2
+
+    @pytest.mark.asyncio
+    async def test_name_search_fetch_all_keeps_person_filter(self, vehicle_registry):
+        """The full-list fetch of a Filter-only tool stays scoped to the user."""
+        resolver = DependencyResolver(vehicle_registry)
+        executor = MagicMock()
+        executor.execute = AsyncMock(side_effect=[
+            MagicMock(success=True, data=[]),
+            MagicMock(success=True, data=[{"Id": "v-2", "Name": "Golf"}]),
+        ])
+        reference = EntityReference("vehicle", "name", "Golf")
+
+        result = await resolver.resolve_entity_reference(
+            reference, {"person_id": "p-1"}, executor
+        )
+
+        assert result.resolved_value == "v-2"
+        calls = executor.execute.await_args_list
+        assert calls[0].kwargs["llm_params"] == {"Filter": "PersonId(=)p-1;Name(~)Golf"}
+        assert calls[1].kwargs["llm_params"] == {"Filter": "PersonId(=)p-1"}
+
+    @pytest.mark.asyncio
+    async def test_name_search_skips_fetch_all_without_person_scope(self, vehicle_registry):
+        """A tool that cannot filter by person is never searched tenant-wide."""
+        vehicle_registry.tools["get_Vehicles"].parameters = {}
+        resolver = DependencyResolver(vehicle_registry)
+        executor = MagicMock()
+        executor.execute = AsyncMock(return_value=MagicMock(success=True, data=[]))
+        reference = EntityReference("vehicle", "name", "Golf")
+
+        result = await resolver.resolve_entity_reference(
+            reference, {"person_id": "p-1"}, executor
+        )
+
+        assert not result.success
+        assert "nije pronađeno" in result.error_message
+        assert executor.execute.await_count == 1
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("status,code,expected_calls", [
+        (400, "HTTP_400", 2),
+        (None, "PARAMETER_VALIDATION_ERROR", 2),
+        (401, "HTTP_401", 1),
+        (None, "EXECUTION_ERROR", 1),
+    ])
+    async def test_name_search_fetches_all_only_on_filter_error(
+        self, vehicle_registry, status, code, expected_calls
+    ):
+        """Only a rejected Filter (not transport/auth errors) triggers the full fetch."""
+        resolver = DependencyResolver(vehicle_registry)
+        executor = MagicMock()
+        executor.execute = AsyncMock(side_effect=[
+            MagicMock(success=False, data=None, http_status=status,
+                      error_code=code, error_message="failed"),
+            MagicMock(success=True, data=[{"Id": "v-2", "Name": "Golf"}]),
+        ])
+        reference = EntityReference("vehicle", "name", "Golf")
+
+        result = await resolver.resolve_entity_reference(
+            reference, {"person_id": "p-1"}, executor
+        )
+
+        assert executor.execute.await_count == expected_calls
+        assert result.success == (expected_calls == 2)
+        if expected_calls == 2:
+            params = executor.execute.await_args.kwargs["llm_params"]
+            assert params == {"Filter": "PersonId(=)p-1"}
+
+    @pytest.mark.asyncio
+    async def test_name_search_reuses_vehicle_list(self, vehicle_registry):
+        """The full list fetched for a name search is reused by the next one."""
+        resolver = DependencyResolver(vehicle_registry)
+        executor = MagicMock()
+        executor.execute = AsyncMock(side_effect=[
+            MagicMock(success=True, data=[]),
+            MagicMock(success=True, data=[{"Id": "v-2", "Name": "Golf"}]),
+            MagicMock(success=True, data=[]),
+        ])
+        user_context = {}
+
+        for _ in range(2):
+            result = await resolver.resolve_entity_reference(
+                EntityReference("vehicle", "name", "Golf"), user_context, executor
+            )
+            assert result.resolved_value == "v-2"
+
+        assert executor.execute.await_count == 3
+
+    def test_fuzzy_choices_reused_per_stored_list(self, resolver):
+        """Choice strings are rebuilt only for a new stored list key."""
+        list_key = ("t-1", "p-1", "get_Vehicles", 1.0)
+
+        first = resolver._get_fuzzy_choices(self.VEHICLES, list_key)
+        again = resolver._get_fuzzy_choices(self.VEHICLES, list_key)
+
+        assert first == ["Passat ZG-1111-AA", "VW Golf 8 ST-2222-BB"]
+        assert again is first
+        assert resolver._get_fuzzy_choices(self.VEHICLES, None) is not first
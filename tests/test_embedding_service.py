@@ -0,0 +1,114 @@
+"""
+Tests for the shared embedding service
+Version: 1.0
+
+Tests the two-level embedding cache and batch fallback.
+"""
+
+import json
+from types import SimpleNamespace
+
+import pytest
+from unittest.mock import AsyncMock, MagicMock
+
+from services import embedding_service
+
+
+def _response(embeddings):
+    """Embeddings API response with one item per embedding."""
+    return SimpleNamespace(data=[
+        SimpleNamespace(index=i, embedding=embedding)
+        for i, embedding in enumerate(embeddings)
+    ])
+
+
+class TestEmbeddingService:
+    """Test get_embedding and get_embeddings_batch."""
+
+    @pytest.fixture
+    def client(self, monkeypatch):
+        """Mock embeddings client with empty L1 and no Redis."""
+        client = MagicMock()
+        client.embeddings.create = AsyncMock()
+        monkeypatch.setattr(embedding_service, "_get_client", lambda: client)
+        monkeypatch.setattr(embedding_service, "_redis", None)
+        monkeypatch.setattr(embedding_service.settings, "ENABLE_EMBEDDING_CACHE", True)
+        embedding_service._L1.clear()
+        yield client
+        embedding_service._L1.clear()
+
+    async def test_cache_hit_skips_client(self, client):
+        """A repeated text is served from L1 without another request."""
+        client.embeddings.create.return_value = _response([[0.1, 0.2]])
+
+        first = await embedding_service.get_embedding("moje vozilo")
+        second = await embedding_service.get_embedding("moje vozilo")
+
+        assert first == second == [0.1, 0.2]
+        client.embeddings.create.assert_awaited_once()
+
+    async def test_cache_hit_returns_copy(self, client):
+        """Mutating a returned embedding does not change the cached one."""
+        client.embeddings.create.return_value = _response([[0.1, 0.2]])
+
+        first = await embedding_service.get_embedding("moje vozilo")
+        first.append(9.9)
+
+        assert await embedding_service.get_embedding("moje vozilo") == [0.1, 0.2]
+
+    async def test_redis_hit_promoted_to_l1(self, client, monkeypatch):
+        """An L2 hit skips the client and is kept in L1."""
+        redis = MagicMock()
+        redis.get = AsyncMock(return_value=json.dumps([0.3, 0.4]))
+        monkeypatch.setattr(embedding_service, "_redis", redis)
+
+        assert await embedding_service.get_embedding("kilometraža") == [0.3, 0.4]
+        assert await embedding_service.get_embedding("kilometraža") == [0.3, 0.4]
+
+        redis.get.assert_awaited_once()
+        client.embeddings.create.assert_not_awaited()
+
+    async def test_batch_skips_cached_and_duplicate_texts(self, client):
+        """Only uncached unique texts are sent, in one request."""
+        client.embeddings.create.return_value = _response([[1.0]])
+        await embedding_service.get_embedding("a")
+        client.embeddings.create.reset_mock()
+        client.embeddings.create.return_value = _response([[2.0]])
+
+        result = await embedding_service.get_embeddings_batch(["a", "b", "b", ""])
+
+        assert result == [[1.0], [2.0], [2.0], None]
+        client.embeddings.create.assert_awaited_once()
+        assert client.embeddings.create.await_args.kwargs["input"] == ["b"]
+
+    async def test_failed_chunk_falls_back_per_text(self, client):
+        """A rejected batch request is retried text by text."""
+        client.embeddings.create.side_effect = [
+            RuntimeError("request too large"),
+            _response([[1.0]]),
+            _response([[2.0]]),
+        ]
+
+        result = await embedding_service.get_embeddings_batch(["a", "b"])
+
+        assert sorted(result) == [[1.0], [2.0]]
+        inputs = [call.kwargs["input"] for call in client.embeddings.create.await_args_list]
+        assert inputs[0] == ["a", "b"]
+        assert sorted(inputs[1:]) == [["a"], ["b"]]
+
+    async def test_batch_reads_and_writes_redis(self, client, monkeypatch):
+        """Batch lookups use Redis hits and store new embeddings there."""
+        key = embedding_service.EMBEDDING_KEY_PREFIX + embedding_service._cache_key("a")
+        stored = {key: "[1.0]"}
+        redis = MagicMock()
+        redis.get = AsyncMock(side_effect=lambda key: stored.get(key))
+        redis.setex = AsyncMock()
+        monkeypatch.setattr(embedding_service, "_redis", redis)
+        client.embeddings.create.return_value = _response([[2.0], [3.0]])
+
+        result = await embedding_service.get_embeddings_batch(["a", "b", "c"])
+
+        assert result == [[1.0], [2.0], [3.0]]
+        assert redis.get.await_count == 3
+        assert client.embeddings.create.await_args.kwargs["input"] == ["b", "c"]
+        assert sorted(call.args[2] for call in redis.setex.await_args_list) == ["[2.0]", "[3.0]"]
@@ -7,7 +7,7 @@ from pathlib import Path
 # Add project root to path
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
-from services.patterns import PatternRegistry, normalize_context_key, CONTEXT_KEY_CANONICAL
+from services.patterns import PatternRegistry, compile_union, normalize_context_key, CONTEXT_KEY_CANONICAL
 
 
 def test_uuid_detection():
@@ -124,6 +124,54 @@ def test_value_patterns():
         assert hasattr(p, 'filter_field'), f"Pattern missing 'filter_field' attribute"
         assert hasattr(p, 'description'), f"Pattern missing 'description' attribute"
     print("[OK] All patterns have required attributes")
+
+    # Frozen - hashable, usable as cache keys
+    assert len(set(patterns)) == len(patterns)
+    print("[OK] Patterns are hashable")
+    print()
+
+
+def test_value_pattern_union():
+    """Test combined value pattern matches like the patterns in order."""
+    print("=" * 60)
+    print("TEST: Value Pattern Union")
+    print("=" * 60)
+
+    patterns = PatternRegistry.get_value_patterns()
+    union = compile_union([p.pattern for p in patterns])
+    assert union is not None, "Value patterns should combine into one regex"
+
+    values = ["ZG-1234-AB", "zg 1234 ab", "WVWZZZ1JZXW000001", "A@B.COM", "+385911234567", "GOLF"]
+    for value in values:
+        expected = next((i for i, p in enumerate(patterns) if p.pattern.match(value)), None)
+        match = union.match(value)
+        actual = int(match.lastgroup[1:]) if match else None
+        assert actual == expected, f"{value}: expected pattern {expected}, got {actual}"
+    print(f"[OK] {len(values)} values dispatched to the same pattern")
+
+    exact = compile_union([p.pattern for p in patterns], fold_case=False)
+    assert exact.match("ZG-1234-AB").lastgroup == "p0"
+    assert exact.match("zg-1234-ab") is None, "fold_case=False should not case-fold"
+    print("[OK] fold_case=False drops IGNORECASE")
+    print()
+
+
+def test_value_pattern_prefilters():
+    """Test prefilters never reject a value their pattern matches."""
+    print("=" * 60)
+    print("TEST: Value Pattern Prefilters")
+    print("=" * 60)
+
+    values = [
+        "ZG1234A", "ZG-1234-AB", "ZG\t1234 AB", "ŠK-123-Č", "WVWZZZ1JZXW000001", "A@B.COM",
+        "+385911234567", "00385911234567", "012345678", "GOLF", "12",
+    ]
+    for p in PatternRegistry.get_value_patterns():
+        assert p.prefilter is not None, f"{p.description} has no prefilter"
+        for value in values:
+            if p.pattern.match(value):
+                assert p.prefilter(value), f"{p.description} prefilter rejected {value}"
+    print("[OK] Prefilters accept every matching value")
     print()
 
 
@@ -137,6 +185,8 @@ if __name__ == "__main__":
     test_plate_detection()
     test_context_key_normalization()
     test_value_patterns()
+    test_value_pattern_union()
+    test_value_pattern_prefilters()
 
     print("=" * 60)
     print("[SUCCESS] All pattern tests passed!")
@@ -0,0 +1,61 @@
+"""
+Tests for QueryRouter pattern lookup
+Version: 1.0
+
+Tests that the union-regex gate picks the same rule as the ordered scan.
+"""
+
+import pytest
+
+from services.query_router import QueryRouter
+
+
+class TestQueryRouterFindPattern:
+    """Test QueryRouter._find_pattern against a plain ordered scan."""
+
+    @pytest.fixture(scope="class")
+    def router(self):
+        """Router with compiled rules."""
+        return QueryRouter()
+
+    @staticmethod
+    def _ordered_scan(router, query_lower):
+        """Reference: first pattern in priority order that matches."""
+        for position, (_, compiled, _) in enumerate(router._patterns):
+            if compiled.search(query_lower):
+                return position
+        return None
+
+    @pytest.mark.parametrize("query,intent", [
+        # Union miss - no rule matches
+        ("dobar dan, kako ste?", None),
+        # Union hit - the leftmost match is also the highest priority
+        ("koliko km ima moje vozilo", "GET_MILEAGE"),
+        ("kada ističe registracija", "GET_REGISTRATION_EXPIRY"),
+        # Leftmost match is a later rule; an earlier rule matches further on
+        ("koliko km ima, unesi 15000 km", "INPUT_MILEAGE"),
+    ])
+    def test_union_gate_matches_ordered_scan(self, router, query, intent):
+        """The union gate returns the same pattern as the ordered scan."""
+        position = router._find_pattern(query)
+
+        assert position == self._ordered_scan(router, query)
+        if intent is None:
+            assert position is None
+        else:
+            assert router._patterns[position][0]["intent"] == intent
+
+    def test_leftmost_match_is_not_priority(self, router):
+        """The union's leftmost hit can be a lower-priority rule than the result."""
+        query = "koliko km ima, unesi 15000 km"
+
+        leftmost = int(router._union.search(query).lastgroup[1:])
+
+        assert router._find_pattern(query) < leftmost
+
+    def test_without_union_scans_in_order(self, router, monkeypatch):
+        """With no union available every pattern is checked in order."""
+        monkeypatch.setattr(router, "_union", None)
+
+        for query in ("dobar dan", "koliko km ima, unesi 15000 km"):
+            assert router._find_pattern(query) == self._ordered_scan(router, query)
@@ -0,0 +1,54 @@
+"""
+Tests for slim_for_llm
+Version: 1.0
+
+Tests that API responses are shrunk before they are re-sent to the LLM.
+"""
+
+import pytest
+
+from services.response_extractor import LLM_MAX_LIST_ITEMS, slim_for_llm
+
+
+class TestSlimForLLM:
+    """Test slim_for_llm."""
+
+    def test_drops_null_and_empty_fields(self):
+        """None, empty strings, lists and dicts are removed at every level."""
+        data = {
+            "Id": "v-1",
+            "Name": "Golf",
+            "Description": None,
+            "Notes": "",
+            "Tags": [],
+            "Extra": {},
+            "Driver": {"Name": "Ana", "Phone": None},
+        }
+
+        assert slim_for_llm(data) == {"Id": "v-1", "Name": "Golf", "Driver": {"Name": "Ana"}}
+
+    @pytest.mark.parametrize("value", [0, False, 0.0, "0"])
+    def test_keeps_falsy_values(self, value):
+        """Zero and False carry information and are kept."""
+        assert slim_for_llm({"LastMileage": value}) == {"LastMileage": value}
+
+    def test_truncates_long_lists_with_count(self):
+        """Lists keep LLM_MAX_LIST_ITEMS items plus a '+N' marker."""
+        data = [{"Id": i, "Plate": None} for i in range(LLM_MAX_LIST_ITEMS + 5)]
+
+        slim = slim_for_llm(data)
+
+        assert len(slim) == LLM_MAX_LIST_ITEMS + 1
+        assert slim[0] == {"Id": 0}
+        assert slim[-1] == "... (+5)"
+
+    def test_short_lists_unchanged(self):
+        """Lists up to LLM_MAX_LIST_ITEMS get no marker."""
+        data = {"value": list(range(LLM_MAX_LIST_ITEMS))}
+
+        assert slim_for_llm(data) == data
+
+    @pytest.mark.parametrize("data", [None, "", "tekst", 42, [], {}])
+    def test_scalars_and_empty_top_level(self, data):
+        """Non-container and empty top-level values are returned as-is."""
+        assert slim_for_llm(data) == data
@@ -0,0 +1,79 @@
+"""
+Tests for SearchEngine embedding scoring
+Version: 1.0
+
+Tests that matrix scoring matches pairwise cosine similarity.
+"""
+
+import pytest
+
+from services.registry.search_engine import SearchEngine
+from services.scoring_utils import cosine_similarity
+
+
+class TestSearchEngineScoring:
+    """Test SearchEngine.prepare_embeddings and _score_pool."""
+
+    EMBEDDINGS = {
+        "get_Vehicles": [0.9, 0.1, 0.0, 0.2],
+        "get_Cases": [0.1, 0.8, 0.3, 0.0],
+        "post_Booking": [-0.5, 0.2, 0.7, 0.1],
+        "get_Empty": [],
+    }
+    QUERY = [0.7, 0.3, 0.1, 0.1]
+
+    @pytest.fixture
+    def engine(self):
+        """SearchEngine with its embedding matrix prepared."""
+        engine = SearchEngine()
+        engine.prepare_embeddings(self.EMBEDDINGS)
+        return engine
+
+    def test_matrix_scores_match_cosine_similarity(self, engine):
+        """One matmul gives the same scores as pairwise cosine_similarity."""
+        pool = {"get_Vehicles", "get_Cases", "post_Booking"}
+
+        scored = engine._score_pool(self.QUERY, self.EMBEDDINGS, pool, -1.0)
+
+        assert {op_id for _, op_id in scored} == pool
+        for score, op_id in scored:
+            expected = cosine_similarity(self.QUERY, self.EMBEDDINGS[op_id])
+            assert score == pytest.approx(expected, abs=1e-6)
+
+    def test_min_score_and_pool_filter(self, engine):
+        """Only pool tools at or above min_score are returned."""
+        threshold = cosine_similarity(self.QUERY, self.EMBEDDINGS["get_Cases"])
+
+        scored = engine._score_pool(
+            self.QUERY, self.EMBEDDINGS, {"get_Vehicles", "get_Cases"}, threshold - 1e-6
+        )
+
+        assert sorted(op_id for _, op_id in scored) == ["get_Cases", "get_Vehicles"]
+        assert engine._score_pool(self.QUERY, self.EMBEDDINGS, {"get_Empty"}, -1.0) == []
+
+    def test_mismatched_dimension_rows_skipped(self):
+        """Embeddings with another dimension are left out of the matrix."""
+        engine = SearchEngine()
+        embeddings = {"a": [1.0, 0.0, 0.0], "b": [0.0, 1.0], "c": [0.0, 1.0, 0.0]}
+
+        scored = engine._score_pool([1.0, 1.0, 0.0], embeddings, {"a", "b", "c"}, -1.0)
+
+        assert sorted(op_id for _, op_id in scored) == ["a", "c"]
+        assert engine._matrix.shape == (2, 3)
+
+    def test_query_dimension_mismatch_returns_nothing(self, engine):
+        """A query of another dimension or zero norm scores no tools."""
+        pool = set(self.EMBEDDINGS)
+
+        assert engine._score_pool([1.0, 0.0], self.EMBEDDINGS, pool, -1.0) == []
+        assert engine._score_pool([0.0] * 4, self.EMBEDDINGS, pool, -1.0) == []
+
+    def test_matrix_rebuilt_when_embeddings_change(self, engine):
+        """Adding a tool embedding rebuilds the matrix on the next search."""
+        embeddings = dict(self.EMBEDDINGS)
+        engine.prepare_embeddings(embeddings)
+        embeddings["get_Trips"] = [0.7, 0.3, 0.1, 0.1]
+
+        scored = engine._score_pool(self.QUERY, embeddings, {"get_Trips"}, 0.99)
+
+        assert [op_id for _, op_id in scored] == ["get_Trips"]
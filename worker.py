@@ -247,6 +247,10 @@ class Worker:
         self._cache = CacheService(self.redis)
         self._context = ContextService(self.redis)
 
+        # Share query/category embeddings between workers
+        from services.embedding_service import configure_cache
+        configure_cache(self.redis)
+
         self._whatsapp_service = WhatsAppService()
         health = self._whatsapp_service.health_check()
         log("info", "whatsapp_service_init", {"healthy": health["healthy"]})